@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Asyncio variant of the LinkedIn Ads client
+Fetches campaigns, creatives and analytics concurrently over one aiohttp session
+"""
+
+import asyncio
+import sys
+from datetime import date
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    raise ImportError("AsyncLinkedInAdsClient requires aiohttp: pip install aiohttp")
+
+from linkedin_ads_report import (
+    BaseLinkedInAdsClient,
+    EndpointPreferences,
+    LinkedInAPIError,
+    analytics_date_range,
+    build_maps,
+    build_report,
+    configure_logging,
+    first_page_params,
+    merge_analytics,
+    next_page_params,
+    offset_page_params,
+    print_summary,
+    save_to_csv,
+    split_date_range,
+)
+from linkedin_ads_ratelimit import RETRY_STATUSES, RateLimiter
+
+
+class AsyncLinkedInAdsClient(BaseLinkedInAdsClient):
+    """Async client for LinkedIn Ads API
+    
+    Mirrors ``LinkedInAdsClient`` with coroutine methods. Requests share one
+    keep-alive ``aiohttp.ClientSession`` and at most ``max_concurrency`` of
+    them are in flight at once. Use as an async context manager, or await
+    ``close()`` when done.
+    """
+    
+    def __init__(self, access_token: str, account_id: str,
+                 pool_size: int = 10, timeout: Optional[float] = 30.0,
+                 max_concurrency: int = 8, page_size: int = 100,
+                 session: Optional["aiohttp.ClientSession"] = None,
+                 endpoint_preferences: Optional[EndpointPreferences] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 analytics_chunk=None, chunk_retries: int = 2,
+                 metrics: Optional[List[str]] = None, base_url: str = "https://api.linkedin.com"):
+        super().__init__(access_token, account_id, page_size, endpoint_preferences, rate_limiter,
+                         analytics_chunk, max_concurrency, chunk_retries, metrics=metrics,
+                         base_url=base_url)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._owns_session = session is None
+        self.session = session
+        self._semaphore = None  # type: Optional[asyncio.Semaphore]
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+    
+    async def close(self):
+        """Close the underlying HTTP session if this client created it"""
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Return the shared session, creating it inside the running event loop"""
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=30)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.session
+    
+    async def _get(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """Send a GET request within the rate limit and return the decoded JSON body
+        
+        Throttled and transient failures are retried per the rate limiter
+        without holding a concurrency slot while waiting.
+        """
+        session = self._get_session()
+        attempt = 0
+        while True:
+            await asyncio.sleep(self.rate_limiter.reserve(self.account_id))
+            try:
+                async with self._semaphore:
+                    async with session.get(url, headers=self.headers, params=params) as response:
+                        if response.status == 200:
+                            return await response.json(content_type=None)
+                        status, text = response.status, await response.text()
+                        retry_after = response.headers.get("Retry-After")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not self.rate_limiter.should_retry(None, attempt):
+                    raise
+                await asyncio.sleep(self.rate_limiter.retry_delay(None, attempt))
+            else:
+                if not self.rate_limiter.should_retry(status, attempt):
+                    raise LinkedInAPIError(status, text)
+                await asyncio.sleep(self.rate_limiter.retry_delay(status, attempt, retry_after))
+            attempt += 1
+    
+    async def test_connection(self) -> bool:
+        """Test if the access token is valid"""
+        url = f"{self.base_url}/v2/me"
+        try:
+            self.log.info("Testing API connection...")
+            data = await self._get(url)
+            self.log.info("✓ Connected as: %s %s", data.get("localizedFirstName", ""),
+                          data.get("localizedLastName", ""))
+            return True
+        except LinkedInAPIError as e:
+            self.log.error("✗ Connection failed: %s\n  Response: %s", e.status_code, e.text)
+            return False
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.log.error("✗ Connection error: %s", e)
+            return False
+    
+    async def _paginate(self, url: str, params: Dict, paging: str,
+                        page_size: int) -> AsyncIterator[List[Dict]]:
+        """Yield the elements of each page, fetching offset pages concurrently
+        
+        When the first page reports a total and came back full, all remaining
+        offset pages are requested at once (see ``offset_page_params``);
+        otherwise, and for cursor pages, which depend on the previous token,
+        pages are walked in sequence.
+        """
+        page_params = first_page_params(params, paging, page_size)
+        data = await self._get(url, page_params)
+        yield data.get("elements", [])
+        
+        remaining = offset_page_params(page_params, data)
+        if remaining:
+            pages = await asyncio.gather(*(self._get(url, p) for p in remaining))
+            for page in pages:
+                yield page.get("elements", [])
+            return
+        
+        page_params = next_page_params(page_params, data)
+        while page_params is not None:
+            data = await self._get(url, page_params)
+            yield data.get("elements", [])
+            page_params = next_page_params(page_params, data)
+    
+    async def _fetch_elements(self, resource: str, endpoints: List[Tuple[str, Dict, str]],
+                              page_size: Optional[int] = None, strict: bool = False) -> List[Dict]:
+        """Collect elements from the first endpoint variant that returns data
+        
+        With ``strict``, errors are raised instead of reported (see
+        ``LinkedInAdsClient._iter_elements``).
+        """
+        page_size = page_size or self.page_size
+        last_error = None
+        answered = False
+        
+        for url, params, paging in self.endpoint_preferences.order(resource, endpoints):
+            self.log.debug("  Trying: %s", url)
+            pages = self._paginate(url, params, paging, page_size)
+            try:
+                elements = await pages.__anext__()
+            except StopAsyncIteration:
+                continue
+            except LinkedInAPIError as e:
+                self.log.debug("  Status: %s\n  Response: %.200s", e.status_code, e.text)
+                if e.status_code not in RETRY_STATUSES:
+                    self.endpoint_preferences.forget(resource, url)
+                last_error = e
+                continue
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.log.debug("  Error: %s", e)
+                last_error = e
+                continue
+            
+            self.log.debug("  Status: 200 (%s)", url)
+            answered = True
+            if not elements:
+                continue
+            
+            self.endpoint_preferences.record(resource, url)
+            results = list(elements)
+            try:
+                async for elements in pages:
+                    results.extend(elements)
+            except (LinkedInAPIError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if strict:
+                    raise
+                self.log.warning("  ✗ Pagination stopped after %d %s: %s", len(results), resource, e)
+            self.log.info("  ✓ Success! Found %d %s", len(results), resource)
+            return results
+        
+        if strict and not answered and last_error is not None:
+            raise last_error
+        self.log.warning("  ✗ All %s endpoints failed", resource)
+        return []
+    
+    async def get_campaigns(self, page_size: Optional[int] = None) -> List[Dict]:
+        """Fetch all campaigns for the account"""
+        return await self._fetch_elements("campaigns", self._campaign_endpoints(), page_size)
+    
+    async def get_creatives(self, page_size: Optional[int] = None) -> List[Dict]:
+        """Fetch all creatives (ads) for the account"""
+        return await self._fetch_elements("creatives", self._creative_endpoints(), page_size)
+    
+    async def get_analytics(self, days: int = 7, page_size: Optional[int] = None) -> List[Dict]:
+        """Fetch analytics data for the last N days
+        
+        When ``analytics_chunk`` is set the range is fetched as concurrent
+        windows and the results are merged by pivot values.
+        """
+        start_date, end_date = analytics_date_range(days)
+        windows = split_date_range(start_date, end_date, self.analytics_chunk) if self.analytics_chunk else []
+        if len(windows) <= 1:
+            endpoints = self._analytics_endpoints(start_date, end_date)
+            return await self._fetch_elements("analytics records", endpoints, page_size)
+        
+        self.log.info("  Splitting %d days into %d %s windows", days, len(windows), self.analytics_chunk)
+        chunks = []
+        if self.endpoint_preferences.get("analytics records") is None:
+            chunks.append(await self._fetch_analytics_window(windows[0], page_size))
+            windows = windows[1:]
+        chunks.extend(await asyncio.gather(*(self._fetch_analytics_window(w, page_size) for w in windows)))
+        return merge_analytics(chunks)
+    
+    async def _fetch_analytics_window(self, window: Tuple[date, date],
+                                      page_size: Optional[int] = None) -> List[Dict]:
+        """Fetch one analytics window, retrying it on its own if it fails"""
+        start_date, end_date = window
+        endpoints = self._analytics_endpoints(start_date, end_date)
+        for attempt in range(self.chunk_retries + 1):
+            try:
+                return await self._fetch_elements("analytics records", endpoints, page_size, strict=True)
+            except (LinkedInAPIError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.log.warning("  ✗ Window %s → %s failed (attempt %d): %s", start_date, end_date, attempt + 1, e)
+        self.log.error("  ✗ Giving up on window %s → %s", start_date, end_date)
+        return []
+
+
+async def generate_report(client: AsyncLinkedInAdsClient, days: int = 7) -> List[Dict]:
+    """Generate the ads performance report, fetching all endpoints concurrently"""
+    
+    client.log.info("Fetching LinkedIn Ads data for the last %d days...", days)
+    client.log.info("→ Fetching campaigns, creatives and analytics...")
+    campaigns, creatives, analytics = await asyncio.gather(
+        client.get_campaigns(),
+        client.get_creatives(),
+        client.get_analytics(days)
+    )
+    
+    campaigns_map, creatives_map = build_maps(campaigns, creatives)
+    return build_report(client, campaigns_map, creatives_map, analytics)
+
+
+async def run_report(access_token: str, account_id: str, days: int = 7):
+    """Run the connection check, report generation and output for one account"""
+    async with AsyncLinkedInAdsClient(access_token, account_id) as client:
+        if not await client.test_connection():
+            client.log.error("✗ Failed to connect to LinkedIn API")
+            sys.exit(1)
+        
+        report_data = await generate_report(client, days)
+    
+    if report_data:
+        print_summary(report_data)
+        save_to_csv(report_data)
+        client.log.info("✓ Report generation complete!")
+    else:
+        client.log.error("✗ No data retrieved")
+
+
+def main():
+    """Main execution function"""
+    if len(sys.argv) < 3:
+        print("Usage: python linkedin_ads_async.py <ACCESS_TOKEN> <ACCOUNT_ID> [DAYS]")
+        sys.exit(1)
+    
+    days = int(sys.argv[3]) if len(sys.argv) > 3 else 7
+    configure_logging()
+    asyncio.run(run_report(sys.argv[1], sys.argv[2], days))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Access token check cache for the LinkedIn Ads client
+Remembers tokens that recently passed the connection check, stored only as SHA-256 hashes
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+
+logger = logging.getLogger("linkedin_ads")
+
+
+class TokenCheckCache:
+    """Remembers access tokens that recently passed the connection check
+    
+    Tokens are kept as SHA-256 hashes, never in the clear. A token checked
+    less than ``ttl`` seconds ago is trusted without another ``/v2/me``
+    round trip; with a ``path`` the checks are persisted as JSON so
+    scheduled runs share them.
+    """
+    
+    def __init__(self, path: Optional[str] = None, ttl: float = 3600):
+        self.path = path
+        self.ttl = ttl
+        self._checked = {}  # token hash -> checked_at
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+    
+    @staticmethod
+    def token_hash(access_token: str) -> str:
+        return hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+    
+    def _load(self):
+        """Read unexpired checks from disk, ignoring a missing or corrupt file"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        self._checked = {
+            token_hash: checked_at for token_hash, checked_at in stored.items()
+            if isinstance(checked_at, (int, float)) and now - checked_at < self.ttl
+        }
+    
+    def _save(self):
+        """Write checks to disk atomically"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._checked, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not save token checks: %s", e)
+    
+    def checked_at(self, access_token: str) -> Optional[float]:
+        """When the token last passed a check, or None if that is unknown or older than ``ttl``"""
+        with self._lock:
+            checked_at = self._checked.get(self.token_hash(access_token))
+        if checked_at is None or time.time() - checked_at >= self.ttl:
+            return None
+        return checked_at
+    
+    def record(self, access_token: str):
+        """Remember that the token works (a fresh check is kept as is)"""
+        if self.checked_at(access_token) is not None:
+            return
+        with self._lock:
+            self._checked[self.token_hash(access_token)] = time.time()
+            self._save()
+    
+    def forget(self, access_token: str):
+        """Drop the check of a token the API has rejected"""
+        with self._lock:
+            if self._checked.pop(self.token_hash(access_token), None) is not None:
+                self._save()
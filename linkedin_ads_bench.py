@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the LinkedIn Ads report pipeline
+Times generate_report, print_summary and save_to_csv on synthetic data and checks them against a baseline
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from linkedin_ads_metrics import REPORT_COLUMNS
+from linkedin_ads_report import (
+    BaseLinkedInAdsClient,
+    generate_report,
+    print_summary,
+    save_to_csv,
+)
+
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+CASES = ["generate_report", "generate_report[arrow]", "print_summary", "save_to_csv", "save_to_csv[gzip]"]
+
+
+class FixtureClient(BaseLinkedInAdsClient):
+    """Client serving synthetic campaigns, creatives and analytics from memory
+
+    ``rows`` analytics records reference ``rows`` creatives spread over
+    ``rows // 100`` campaigns, each creative with a sponsoredContent landing page.
+    """
+
+    def __init__(self, rows: int):
+        super().__init__("benchmark", "507539077")
+        self.referenced_only = False
+        campaigns = max(rows // 100, 1)
+        self.campaigns = [{"id": 600000000 + i, "name": f"Campaign {i}", "status": "ACTIVE"}
+                          for i in range(campaigns)]
+        self.creatives = [{"id": f"urn:li:sponsoredCreative:{800000000 + i}", "name": f"Creative {i}",
+                           "content": {"sponsoredContent": {"landingPage": f"https://example.com/{i % 5000}"}}}
+                          for i in range(rows)]
+        self.analytics = [{
+            "pivotValues": [f"urn:li:sponsoredCampaign:{600000000 + i % campaigns}",
+                            f"urn:li:sponsoredCreative:{800000000 + i}"],
+            "clicks": (i * 7919) % 1000,
+            "impressions": 1000 + (i * 104729) % 100000,
+            "landingPageClicks": (i * 31) % 900
+        } for i in range(rows)]
+
+    def get_campaigns(self, page_size: Optional[int] = None) -> List[Dict]:
+        return self.campaigns
+
+    def get_creatives(self, page_size: Optional[int] = None) -> List[Dict]:
+        return self.creatives
+
+    def get_analytics(self, days: int = 7, page_size: Optional[int] = None) -> List[Dict]:
+        return self.analytics
+
+    def iter_analytics(self, days: int = 7, page_size: Optional[int] = None):
+        return iter(self.analytics)
+
+
+def reset_peak_rss():
+    """Reset this process's peak RSS where the OS allows it (Linux)
+
+    On Linux ``ru_maxrss`` survives ``exec``, so a benchmark child would
+    report the parent's peak; clearing it makes the peak the child's own.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process since the last reset, in MB"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def case_function(case: str, client: FixtureClient, workdir: str):
+    """Return a zero-argument callable running one benchmark case"""
+    if case == "generate_report":
+        return lambda: generate_report(client, 7)
+    if case == "generate_report[arrow]":
+        return lambda: generate_report(client, 7, engine="arrow")
+    if case in ("print_summary", "save_to_csv", "save_to_csv[gzip]"):
+        report = generate_report(client, 7)
+        if case == "print_summary":
+            return lambda: print_summary(report)
+        filename = os.path.join(workdir, "report.csv.gz" if case.endswith("[gzip]") else "report.csv")
+        return lambda: save_to_csv(report, filename, REPORT_COLUMNS)
+    raise ValueError(f"Unknown benchmark case {case!r}; choose from {', '.join(CASES)}")
+
+
+def run_case(case: str, rows: int, repeat: int = 3, trace: bool = True) -> Dict:
+    """Run one case in this process and return its measurements
+
+    Throughput is from the best of ``repeat`` untraced runs. ``rss_delta_mb``
+    is how far the run pushed peak RSS above the fixtures alone. With
+    ``trace``, a final run under tracemalloc records the peak traced bytes
+    and the number of allocated blocks held by its result (e.g. report rows).
+    """
+    reset_peak_rss()
+    client = FixtureClient(rows)
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            func = case_function(case, client, workdir)
+            rss_before = peak_rss_mb()
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                func()
+                best = min(best, time.perf_counter() - started)
+            result = {
+                "case": case,
+                "rows": rows,
+                "seconds": best,
+                "rows_per_s": rows / best if best > 0 else float("inf"),
+                "peak_rss_mb": peak_rss_mb(),
+                "rss_delta_mb": peak_rss_mb() - rss_before
+            }
+            if trace:
+                tracemalloc.start()
+                blocks_before = sys.getallocatedblocks()
+                output = func()
+                result["alloc_peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                result["alloc_blocks"] = sys.getallocatedblocks() - blocks_before
+                tracemalloc.stop()
+                del output
+    return result
+
+
+def run_isolated(case: str, rows: int, repeat: int, trace: bool) -> Optional[Dict]:
+    """Run one case in a fresh interpreter so peak RSS is its own"""
+    command = [sys.executable, os.path.abspath(__file__), "--run-one", case, str(rows), "--repeat", str(repeat)]
+    if not trace:
+        command.append("--no-trace")
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        print(f"  ✗ {case} @ {rows:,} rows failed: {completed.stderr.strip().splitlines()[-1:]}")
+        return None
+    return json.loads(completed.stdout)
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Return a description of every regression against the baseline
+
+    A case regresses when its throughput drops, or its peak RSS grows, by
+    more than ``tolerance`` (a fraction) relative to the baseline.
+    """
+    regressions = []
+    for result in results:
+        key = f"{result['case']}@{result['rows']}"
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if result["rows_per_s"] < base["rows_per_s"] * (1 - tolerance):
+            regressions.append(f"{key}: {result['rows_per_s']:,.0f} rows/s vs baseline {base['rows_per_s']:,.0f}")
+        if result["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{key}: peak RSS {result['peak_rss_mb']:,.1f} MB vs baseline {base['peak_rss_mb']:,.1f}")
+    return regressions
+
+
+def print_results(results: List[Dict]):
+    """Print one line of measurements per case and size"""
+    print("\n" + "="*100)
+    print(f"{'Case':<26} {'Rows':>10} {'Seconds':>9} {'Rows/s':>12} {'Peak RSS MB':>12} "
+          f"{'Δ RSS MB':>9} {'Alloc MB':>9} {'Blocks':>10}")
+    print("-"*100)
+    for r in results:
+        alloc = f"{r['alloc_peak_mb']:>9.1f}" if "alloc_peak_mb" in r else f"{'-':>9}"
+        blocks = f"{r['alloc_blocks']:>10,}" if "alloc_blocks" in r else f"{'-':>10}"
+        print(f"{r['case']:<26} {r['rows']:>10,} {r['seconds']:>9.3f} {r['rows_per_s']:>12,.0f} "
+              f"{r['peak_rss_mb']:>12.1f} {r['rss_delta_mb']:>9.1f} {alloc} {blocks}")
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the LinkedIn Ads report pipeline on synthetic data",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""Example:
+  python linkedin_ads_bench.py --save-baseline
+  python linkedin_ads_bench.py --sizes 1000,100000 --cases generate_report,save_to_csv
+  python linkedin_ads_bench.py --sizes 10000000 --no-trace"""
+    )
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated row counts (default: 1k to 1M; 10M needs several GB)")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated cases to run")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the best counts")
+    parser.add_argument("--no-trace", action="store_true", help="skip the tracemalloc allocation run")
+    parser.add_argument("--trace-max-rows", type=int, default=1000000,
+                        help="only trace allocations up to this many rows (default: 1000000)")
+    parser.add_argument("--baseline", default="benchmark_baseline.json",
+                        help="baseline results file (default: benchmark_baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown / RSS growth before failing (default: 0.2)")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to this JSON file")
+    parser.add_argument("--run-one", nargs=2, metavar=("CASE", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        case, rows = args.run_one
+        print(json.dumps(run_case(case, int(rows), args.repeat, not args.no_trace)))
+        return
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s) {', '.join(unknown)}; choose from {', '.join(CASES)}")
+    # Probe without importing, so pyarrow does not inflate this process
+    if "generate_report[arrow]" in cases and importlib.util.find_spec("pyarrow") is None:
+        print("pyarrow not installed; skipping generate_report[arrow]")
+        cases.remove("generate_report[arrow]")
+
+    results = []
+    failed = []
+    for rows in (int(s) for s in args.sizes.split(",") if s.strip()):
+        for case in cases:
+            print(f"→ {case} @ {rows:,} rows...")
+            trace = not args.no_trace and rows <= args.trace_max_rows
+            result = run_isolated(case, rows, args.repeat, trace)
+            if result is None:
+                failed.append(f"{case}@{rows}")
+            else:
+                results.append(result)
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if failed:
+        print(f"\n✗ {len(failed)} case(s) failed: {', '.join(failed)}")
+        sys.exit(1)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({f"{r['case']}@{r['rows']}": r for r in results}, f, indent=2)
+        print(f"\n✓ Baseline saved to: {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print(f"\n✓ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+On-disk HTTP response cache for the LinkedIn Ads client
+Caches JSON response bodies with their ETag/Last-Modified validators
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+def cache_key(url: str, params: Optional[Dict], api_version: str, access_token: str) -> str:
+    """Build a cache key from the URL, query params, API version and token
+    
+    The token is part of the key (as a SHA-256 hash) so a cache file shared
+    between tokens never serves one token's responses to another.
+    """
+    token_hash = hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+    payload = json.dumps([url, sorted((params or {}).items()), api_version, token_hash], default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Interface for response cache backends
+    
+    An entry is a dict with ``data`` (decoded JSON body), ``etag``,
+    ``last_modified`` and ``stored_at`` (epoch seconds).
+    """
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the entry for ``key``, or None"""
+        raise NotImplementedError
+    
+    def set(self, key: str, entry: Dict):
+        """Store an entry under ``key``"""
+        raise NotImplementedError
+    
+    def touch(self, key: str):
+        """Mark an entry as revalidated now"""
+        raise NotImplementedError
+    
+    def close(self):
+        """Release any resources held by the backend"""
+
+
+class SQLiteResponseCache(ResponseCache):
+    """Response cache in a SQLite file, evicting least recently used entries
+    
+    The total size of stored bodies is kept under ``max_bytes``. Safe to
+    share between threads.
+    """
+    
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body TEXT NOT NULL, etag TEXT, last_modified TEXT, "
+            "stored_at REAL NOT NULL, last_access REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        body, etag, last_modified, stored_at = row
+        return {"data": json.loads(body), "etag": etag, "last_modified": last_modified, "stored_at": stored_at}
+    
+    def set(self, key: str, entry: Dict):
+        body = json.dumps(entry["data"])
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, entry.get("etag"), entry.get("last_modified"),
+                 entry.get("stored_at", now), now, len(body))
+            )
+            self._evict()
+    
+    def touch(self, key: str):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE responses SET stored_at = ?, last_access = ? WHERE key = ?",
+                               (now, now, key))
+    
+    def _evict(self):
+        """Delete least recently used entries until the cache fits in ``max_bytes``"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+    
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,121 @@
+"""
+Columnar Parquet / Arrow IPC (Feather) writers for LinkedIn Ads report data
+Requires the optional pyarrow package
+"""
+
+import itertools
+import logging
+import os
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather  # noqa: F401 - registers pa.feather
+    import pyarrow.ipc  # noqa: F401
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    raise ImportError("Parquet/Arrow output requires pyarrow: pip install pyarrow")
+
+
+logger = logging.getLogger("linkedin_ads.columnar")
+
+# Typed schema of a report row: string IDs, int64 counts, and dictionary
+# encoded low-cardinality text columns
+REPORT_SCHEMA = pa.schema([
+    ("campaign_id", pa.string()),
+    ("campaign_name", pa.dictionary(pa.int32(), pa.string())),
+    ("campaign_status", pa.dictionary(pa.int8(), pa.string())),
+    ("creative_id", pa.string()),
+    ("creative_name", pa.dictionary(pa.int32(), pa.string())),
+    ("landing_page", pa.dictionary(pa.int32(), pa.string())),
+    ("clicks", pa.int64()),
+    ("impressions", pa.int64()),
+    ("landing_page_clicks", pa.int64()),
+])
+
+# Schema of the combined multi-account report
+COMBINED_SCHEMA = REPORT_SCHEMA.insert(0, pa.field("account_id", pa.string()))
+
+# Types of the optional metric columns; unlisted metrics are int64 counts
+METRIC_TYPES = {
+    "cost_in_local_currency": pa.float64(),
+    "ctr": pa.float64(),
+    "cpc": pa.float64(),
+}
+
+# Output formats by file suffix
+FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+
+def report_schema(columns: List[str]) -> pa.Schema:
+    """Schema for a report with the given columns (see ``report_columns``)"""
+    fields = {field.name: field for field in COMBINED_SCHEMA}
+    return pa.schema([fields.get(name) or pa.field(name, METRIC_TYPES.get(name, pa.int64()))
+                      for name in columns])
+
+
+def rows_to_batch(rows: List[Dict], schema: pa.Schema) -> pa.RecordBatch:
+    """Convert a chunk of report rows into a record batch with the given schema"""
+    arrays = []
+    for field in schema:
+        values = [row.get(field.name) for row in rows]
+        if pa.types.is_string(field.type):
+            values = [None if v is None else str(v) for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def save_to_columnar(data: Iterable[Dict], filename: str, schema: pa.Schema = REPORT_SCHEMA,
+                     file_format: Optional[str] = None, row_group_size: int = 100000,
+                     compression: str = "zstd") -> int:
+    """Save report rows to a Parquet or Arrow IPC (Feather v2) file
+    
+    Rows are consumed from any iterable and written one row group (or
+    record batch) of ``row_group_size`` rows at a time, so memory use stays
+    bounded. ``file_format`` ("parquet" or "arrow") defaults to the file
+    suffix. Returns the number of rows written.
+    """
+    file_format = file_format or FORMATS.get(os.path.splitext(filename)[1])
+    if file_format not in ("parquet", "arrow"):
+        raise ValueError(f"Unknown columnar format for {filename}; use .parquet, .arrow or .feather")
+    
+    rows = iter(data)
+    count = 0
+    if file_format == "parquet":
+        writer = pq.ParquetWriter(filename, schema, compression=compression)
+    else:
+        writer = pa.ipc.new_file(filename, schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+    try:
+        while True:
+            chunk = list(itertools.islice(rows, row_group_size))
+            if not chunk:
+                break
+            batch = rows_to_batch(chunk, schema)
+            if file_format == "parquet":
+                writer.write_batch(batch, row_group_size=row_group_size)
+            else:
+                writer.write_batch(batch)
+            count += len(chunk)
+    finally:
+        writer.close()
+    
+    logger.info("✓ Report saved to: %s", filename)
+    return count
+
+
+def save_table(table: pa.Table, filename: str, schema: pa.Schema = REPORT_SCHEMA,
+               file_format: Optional[str] = None, row_group_size: int = 100000,
+               compression: str = "zstd") -> int:
+    """Save an in-memory report table to a Parquet or Arrow IPC file, cast to ``schema``"""
+    file_format = file_format or FORMATS.get(os.path.splitext(filename)[1])
+    table = table.cast(schema)
+    if file_format == "parquet":
+        pq.write_table(table, filename, row_group_size=row_group_size, compression=compression)
+    elif file_format == "arrow":
+        with pa.ipc.new_file(filename, schema, options=pa.ipc.IpcWriteOptions(compression=compression)) as writer:
+            writer.write_table(table, max_chunksize=row_group_size)
+    else:
+        raise ValueError(f"Unknown columnar format for {filename}; use .parquet, .arrow or .feather")
+    
+    logger.info("✓ Report saved to: %s", filename)
+    return table.num_rows
@@ -0,0 +1,256 @@
+"""
+Request and stage instrumentation for the LinkedIn Ads client
+Timed connections for requests sessions, plus pluggable sinks for JSON lines, histograms and Prometheus
+"""
+
+import bisect
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Connection setup timings of the current thread's last request
+_phases = threading.local()
+
+
+def reset_phases():
+    """Forget the connection timings recorded for this thread"""
+    _phases.connect = None
+    _phases.tls = None
+
+
+def current_phases() -> Tuple[Optional[float], Optional[float]]:
+    """(connect, tls) seconds of the connection opened by this thread's last request
+
+    Both are None when the request reused a pooled connection. ``connect``
+    covers DNS resolution and the TCP handshake, which urllib3 performs as
+    one step.
+    """
+    return getattr(_phases, "connect", None), getattr(_phases, "tls", None)
+
+
+class TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        started = time.perf_counter()
+        sock = super()._new_conn()
+        _phases.connect = time.perf_counter() - started
+        return sock
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        started = time.perf_counter()
+        sock = super()._new_conn()
+        _phases.connect = time.perf_counter() - started
+        return sock
+
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        # connect() opens the socket (timed above) and then does the TLS handshake
+        _phases.tls = time.perf_counter() - started - (getattr(_phases, "connect", None) or 0)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose new connections record connect and TLS timings (see ``current_phases``)"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+class Sink:
+    """Interface for instrumentation event consumers
+
+    Request events have ``type`` "request" and carry ``endpoint``,
+    ``variant``, ``status``, ``bytes``, ``attempt``, ``retry`` (whether
+    another attempt follows) and ``connect``/``tls``/``ttfb``/``total``
+    seconds. Stage events have ``type`` "stage", ``stage`` and ``seconds``.
+    """
+
+    def emit(self, event: Dict):
+        raise NotImplementedError
+
+    def close(self):
+        """Flush and release any resources held by the sink"""
+
+
+class JSONLinesSink(Sink):
+    """Append every event as one JSON line to a file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def emit(self, event: Dict):
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class HistogramSink(Sink):
+    """In-memory request counts, bytes and latency histograms per endpoint, plus stage totals"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.requests = {}  # type: Dict[Tuple[str, str, str], Dict]
+        self.stages = {}  # type: Dict[str, float]
+        self._lock = threading.Lock()
+
+    def emit(self, event: Dict):
+        with self._lock:
+            if event["type"] == "stage":
+                self.stages[event["stage"]] = self.stages.get(event["stage"], 0.0) + event["seconds"]
+                return
+            key = (event["endpoint"], event["variant"], str(event["status"]))
+            entry = self.requests.get(key)
+            if entry is None:
+                entry = self.requests[key] = {"count": 0, "bytes": 0, "retries": 0, "sum": 0.0,
+                                              "max": 0.0, "buckets": [0] * (len(self.buckets) + 1)}
+            total = event["total"]
+            entry["count"] += 1
+            entry["bytes"] += event["bytes"]
+            entry["retries"] += 1 if event["retry"] else 0
+            entry["sum"] += total
+            entry["max"] = max(entry["max"], total)
+            entry["buckets"][bisect.bisect_left(self.buckets, total)] += 1
+
+    def quantile(self, entry: Dict, q: float) -> float:
+        """Estimate a latency quantile from an entry's buckets (upper bucket bound)"""
+        target = q * entry["count"]
+        seen = 0
+        for bound, count in zip(self.buckets + (entry["max"],), entry["buckets"]):
+            seen += count
+            if seen >= target:
+                return min(bound, entry["max"])
+        return entry["max"]
+
+    def summary(self) -> Dict:
+        """Per endpoint/variant/status stats and per-stage seconds"""
+        with self._lock:
+            endpoints = [{
+                "endpoint": endpoint, "variant": variant, "status": status,
+                "count": e["count"], "bytes": e["bytes"], "retries": e["retries"],
+                "mean": e["sum"] / e["count"], "p50": self.quantile(e, 0.5),
+                "p95": self.quantile(e, 0.95), "max": e["max"]
+            } for (endpoint, variant, status), e in sorted(self.requests.items())]
+            return {"endpoints": endpoints, "stages": dict(self.stages)}
+
+
+class PrometheusTextfileSink(HistogramSink):
+    """Histogram sink that writes Prometheus text exposition format on close
+
+    Suitable for the node_exporter textfile collector; the file is replaced
+    atomically.
+    """
+
+    def __init__(self, path: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(buckets)
+        self.path = path
+
+    def render(self) -> str:
+        lines = [
+            "# HELP linkedin_ads_request_duration_seconds LinkedIn Ads API request duration.",
+            "# TYPE linkedin_ads_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            requests = sorted(self.requests.items())
+            stages = sorted(self.stages.items())
+        for (endpoint, variant, status), e in requests:
+            labels = f'endpoint="{endpoint}",variant="{variant}",status="{status}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, e["buckets"]):
+                cumulative += count
+                lines.append(f'linkedin_ads_request_duration_seconds_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            lines.append(f'linkedin_ads_request_duration_seconds_bucket{{{labels},le="+Inf"}} {e["count"]}')
+            lines.append(f"linkedin_ads_request_duration_seconds_sum{{{labels}}} {e['sum']:.6f}")
+            lines.append(f"linkedin_ads_request_duration_seconds_count{{{labels}}} {e['count']}")
+        lines += ["# HELP linkedin_ads_response_bytes_total Response body bytes received.",
+                  "# TYPE linkedin_ads_response_bytes_total counter"]
+        for (endpoint, variant, status), e in requests:
+            labels = f'endpoint="{endpoint}",variant="{variant}",status="{status}"'
+            lines.append(f"linkedin_ads_response_bytes_total{{{labels}}} {e['bytes']}")
+        lines += ["# HELP linkedin_ads_stage_seconds Time spent in each report stage.",
+                  "# TYPE linkedin_ads_stage_seconds gauge"]
+        for stage, seconds in stages:
+            lines.append(f'linkedin_ads_stage_seconds{{stage="{stage}"}} {seconds:.6f}')
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, self.path)
+
+
+class Instrumentation:
+    """Fan-out of request and stage events to sinks
+
+    With no sinks, recording is skipped entirely, so an idle
+    instrumentation costs almost nothing.
+    """
+
+    def __init__(self, sinks: Optional[List[Sink]] = None):
+        self.sinks = list(sinks or [])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def emit(self, event: Dict):
+        for sink in self.sinks:
+            sink.emit(event)
+
+    def request(self, **fields):
+        """Record one HTTP call"""
+        if self.sinks:
+            self.emit({"type": "request", "ts": time.time(), **fields})
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block of work as a named stage"""
+        if not self.sinks:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.emit({"type": "stage", "ts": time.time(), "stage": name,
+                       "seconds": time.perf_counter() - started})
+
+    def histogram(self) -> Optional[HistogramSink]:
+        """The first histogram sink, if any"""
+        return next((s for s in self.sinks if isinstance(s, HistogramSink)), None)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
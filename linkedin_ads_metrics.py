@@ -0,0 +1,79 @@
+"""
+Report metrics for LinkedIn Ads analytics
+Maps report columns to analytics API fields and defines the derived ratio metrics
+"""
+
+from typing import Iterable, List, Optional
+
+
+# Selectable analytics metrics: report column -> (analytics API field, cast).
+# Values without a cast are passed through as returned by the API
+METRICS = {
+    "clicks": ("clicks", None),
+    "impressions": ("impressions", None),
+    "landing_page_clicks": ("landingPageClicks", None),
+    "cost_in_local_currency": ("costInLocalCurrency", float),
+    "conversions": ("externalWebsiteConversions", None),
+    "video_views": ("videoViews", None),
+}
+
+# Derived metrics: report column -> (numerator column, denominator column)
+DERIVED_METRICS = {
+    "ctr": ("clicks", "impressions"),
+    "cpc": ("cost_in_local_currency", "clicks"),
+}
+
+# Clicks and impressions are always fetched: the report is ranked by clicks
+# and the summary reports CTR
+REQUIRED_METRICS = ["clicks", "impressions"]
+DEFAULT_METRICS = ["clicks", "impressions", "landing_page_clicks"]
+
+# Columns describing the campaign and creative of a report row
+ENTITY_COLUMNS = ["campaign_id", "campaign_name", "campaign_status", "creative_id", "creative_name", "landing_page"]
+
+# Columns of a report row with the default metrics, in output order
+REPORT_COLUMNS = ENTITY_COLUMNS + DEFAULT_METRICS
+
+
+def resolve_metrics(names: Optional[Iterable[str]] = None) -> List[str]:
+    """Validate a metric selection and complete it with required and dependent metrics
+    
+    Returns report metric columns in order: required metrics, then the
+    requested ones, with the inputs of derived metrics placed before them.
+    """
+    if names is None:
+        return list(DEFAULT_METRICS)
+    resolved = list(REQUIRED_METRICS)
+    for name in names:
+        if name not in METRICS and name not in DERIVED_METRICS:
+            known = ", ".join(list(METRICS) + list(DERIVED_METRICS))
+            raise ValueError(f"Unknown metric {name!r}; choose from {known}")
+        for column in DERIVED_METRICS.get(name, ()) + (name,):
+            if column not in resolved:
+                resolved.append(column)
+    return resolved
+
+
+def report_columns(metrics: Optional[List[str]] = None) -> List[str]:
+    """Columns of a report row for a resolved metric selection"""
+    return ENTITY_COLUMNS + (metrics if metrics is not None else DEFAULT_METRICS)
+
+
+def analytics_fields(metrics: List[str]) -> str:
+    """The analytics ``fields`` parameter for a resolved metric selection"""
+    return ",".join([METRICS[m][0] for m in metrics if m in METRICS] + ["pivotValues"])
+
+
+def metric_number(value):
+    """Return a metric value as a number (the API sends some, like cost, as strings)"""
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return 0
+    return value or 0
+
+
+def ratio(numerator, denominator) -> Optional[float]:
+    """Derived metric value, or None when the denominator is zero"""
+    return numerator / denominator if denominator else None
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Local mock of the LinkedIn Ads API for offline tests and load tests
+Serves synthetic campaigns, creatives and analytics with pagination and injectable faults
+"""
+
+import argparse
+import base64
+import json
+import random
+import re
+import threading
+import time
+from datetime import date, timedelta
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+ACCOUNT_URN = re.compile(r"urn:li:sponsoredAccount:(\d+)")
+REST_DATE = re.compile(r"(start|end):\(day:(\d+),month:(\d+),year:(\d+)\)")
+BATCH_PATH = re.compile(r"^/rest/adAccounts/(\d+)/(adCampaigns|creatives)$")
+
+# Analytics API fields served by the mock (see linkedin_ads_report.METRICS)
+METRIC_FIELDS = ("impressions", "clicks", "landingPageClicks", "costInLocalCurrency",
+                 "externalWebsiteConversions", "videoViews")
+
+
+class MockData:
+    """Deterministic synthetic account: N campaigns, M creatives and D days of analytics
+
+    Creative ``i`` belongs to campaign ``i % campaigns``. Only the first
+    ``active_creatives`` creatives have analytics, like a historical account
+    with mostly inactive entities. Metrics are a cheap function of
+    (creative, day), so any date range is reproducible without storing it.
+    """
+
+    def __init__(self, campaigns: int = 10, creatives: int = 100, days: int = 30,
+                 account_id: str = "507539077", active_creatives: Optional[int] = None,
+                 end_date: Optional[date] = None):
+        self.account_id = account_id
+        self.end_date = end_date or date.today()
+        self.start_date = self.end_date - timedelta(days=days)
+        self.active_creatives = creatives if active_creatives is None else min(active_creatives, creatives)
+        self.campaigns = [self._campaign(i) for i in range(campaigns)]
+        self.creatives = [self._creative(i, campaigns) for i in range(creatives)]
+
+    def _campaign(self, i: int) -> Dict:
+        return {
+            "id": 600000000 + i,
+            "name": f"Campaign {i}",
+            "status": ("ACTIVE", "PAUSED", "ARCHIVED")[i % 3],
+            "account": f"urn:li:sponsoredAccount:{self.account_id}"
+        }
+
+    def _creative(self, i: int, campaigns: int) -> Dict:
+        url = f"https://example.com/landing/{i}"
+        # Rotate through the content shapes extract_landing_page understands
+        content = [
+            {"sponsoredContent": {"landingPage": url}},
+            {"textAd": {"landingPage": url}},
+            {"carousel": {"cards": [{"landingPage": url}, {"landingPage": url + "/2"}]}},
+            {"reference": f"urn:li:share:{700000000 + i}"},
+        ][i % 4]
+        creative = {
+            "id": f"urn:li:sponsoredCreative:{800000000 + i}",
+            "name": f"Creative {i}",
+            "campaign": f"urn:li:sponsoredCampaign:{600000000 + i % max(campaigns, 1)}",
+            "content": content
+        }
+        if "reference" in content:
+            creative["directSponsoredContent"] = {"landingPage": url}
+        return creative
+
+    def metrics(self, creative: int, day: int) -> Dict:
+        """Metrics of one creative on one day (``day`` is a date ordinal)"""
+        impressions = 100 + (creative * 7919 + day * 104729) % 5000
+        clicks = impressions * ((creative * 31 + day * 17) % 40) // 1000
+        return {
+            "impressions": impressions,
+            "clicks": clicks,
+            "landingPageClicks": clicks * 9 // 10,
+            "costInLocalCurrency": f"{clicks * 1.37 + impressions * 0.004:.2f}",
+            "externalWebsiteConversions": clicks // 20,
+            "videoViews": impressions // 3 if creative % 4 == 0 else 0,
+        }
+
+    @lru_cache(maxsize=8)
+    def analytics(self, start: date, end: date, granularity: str, fields: Tuple[str, ...]) -> List[Dict]:
+        """Analytics records pivoted by (campaign, creative) for an inclusive range"""
+        start, end = max(start, self.start_date), min(end, self.end_date)
+        metric_fields = [f for f in METRIC_FIELDS if not fields or f in fields]
+        records = []
+        for i in range(self.active_creatives):
+            creative = self.creatives[i]
+            pivot = [creative["campaign"], creative["id"]]
+            periods = {}
+            day = start
+            while day <= end:
+                if granularity == "DAILY":
+                    period = (day, day)
+                elif granularity == "MONTHLY":
+                    period = (max(start, day.replace(day=1)), None)
+                else:
+                    period = (start, end)
+                totals = periods.setdefault(period[0], {f: 0 for f in metric_fields})
+                for field, value in self.metrics(i, day.toordinal()).items():
+                    if field in totals:
+                        totals[field] += float(value) if field == "costInLocalCurrency" else value
+                day += timedelta(days=1)
+            for period_start, totals in periods.items():
+                record = {"pivotValues": pivot}
+                for field, value in totals.items():
+                    record[field] = f"{value:.2f}" if field == "costInLocalCurrency" else value
+                if granularity in ("DAILY", "MONTHLY") and (not fields or "dateRange" in fields):
+                    period_end = period_start if granularity == "DAILY" else min(
+                        end, (period_start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1))
+                    record["dateRange"] = {
+                        "start": {"year": period_start.year, "month": period_start.month, "day": period_start.day},
+                        "end": {"year": period_end.year, "month": period_end.month, "day": period_end.day}
+                    }
+                records.append(record)
+        return records
+
+
+class Faults:
+    """Faults injected into every response: latency, throttling and server errors
+
+    ``latency`` (seconds, plus up to ``jitter``) is added before each reply.
+    A fraction ``rate_429`` of requests get 429 with ``Retry-After``, and a
+    fraction ``rate_5xx`` get a 500/502/503. ``fail_first`` fails the first
+    N requests with 503, to exercise retries deterministically.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, rate_429: float = 0.0,
+                 rate_5xx: float = 0.0, retry_after: float = 1.0, fail_first: int = 0,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self.fail_first = fail_first
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def pick(self) -> Tuple[float, Optional[int]]:
+        """Return (delay, error status or None) for the next request"""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                return delay, 503
+            roll = self._random.random()
+        if roll < self.rate_429:
+            return delay, 429
+        if roll < self.rate_429 + self.rate_5xx:
+            return delay, (500, 502, 503)[int(roll * 1000) % 3]
+        return delay, None
+
+
+def parse_list(value: str) -> List[str]:
+    """Parse a Rest.li ``List(a,b,c)`` value"""
+    value = value.strip()
+    if value.startswith("List(") and value.endswith(")"):
+        value = value[5:-1]
+    return [v for v in value.split(",") if v]
+
+
+def parse_date_range(params: Dict[str, str]) -> Tuple[date, date]:
+    """Read the analytics date range from v2 (``dateRange.start.day``) or REST params"""
+    if "dateRange" in params:
+        parts = {m.group(1): date(int(m.group(4)), int(m.group(3)), int(m.group(2)))
+                 for m in REST_DATE.finditer(params["dateRange"])}
+        return parts["start"], parts["end"]
+    return tuple(date(int(params[f"dateRange.{edge}.year"]), int(params[f"dateRange.{edge}.month"]),
+                      int(params[f"dateRange.{edge}.day"])) for edge in ("start", "end"))
+
+
+def offset_page(elements: List[Dict], params: Dict[str, str], max_page_size: Optional[int] = None,
+                total: bool = True) -> Dict:
+    """Rest.li offset page (start/count), with ``paging.total`` unless ``total`` is False
+
+    With ``max_page_size`` larger counts are capped, like the real API does.
+    """
+    start = int(params.get("start", 0))
+    count = min(int(params.get("count", 100)), max_page_size or float("inf"))
+    paging = {"start": start, "count": count}
+    if total:
+        paging["total"] = len(elements)
+    return {"elements": elements[start:start + count], "paging": paging}
+
+
+def cursor_page(elements: List[Dict], params: Dict[str, str], max_page_size: Optional[int] = None) -> Dict:
+    """Cursor page (pageSize/pageToken) with ``metadata.nextPageToken``"""
+    token = params.get("pageToken")
+    start = int(base64.urlsafe_b64decode(token.encode()).decode()) if token else 0
+    size = min(int(params.get("pageSize", 100)), max_page_size or float("inf"))
+    page = {"elements": elements[start:start + size], "metadata": {}}
+    if start + size < len(elements):
+        page["metadata"]["nextPageToken"] = base64.urlsafe_b64encode(str(start + size).encode()).decode()
+    return page
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Request handler; the server carries ``data``, ``faults`` and ``stats``"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, so client connection pooling is exercised
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Dict, headers: Optional[Dict] = None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.record(self.path.split("?")[0], status)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        delay, error = self.server.faults.pick()
+        if delay:
+            time.sleep(delay)
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            return self._send(401, {"status": 401, "message": "Empty oauth2 access token"})
+        token = self.headers["Authorization"][7:]
+        if self.server.valid_tokens is not None and token not in self.server.valid_tokens:
+            return self._send(401, {"status": 401, "message": "Invalid access token"})
+        if error == 429:
+            return self._send(429, {"status": 429, "message": "Too many requests"},
+                              {"Retry-After": f"{self.server.faults.retry_after:g}"})
+        if error:
+            return self._send(error, {"status": error, "message": "Injected server error"})
+        try:
+            status, body = self.route(url.path, params)
+        except (KeyError, ValueError) as e:
+            status, body = 400, {"status": 400, "message": f"Bad request: {e}"}
+        self._send(status, body)
+
+    def route(self, path: str, params: Dict[str, str]) -> Tuple[int, Dict]:
+        data = self.server.data
+        if path == "/v2/me":
+            return 200, {"id": "mock", "localizedFirstName": "Mock", "localizedLastName": "User"}
+
+        if path == "/v2/adCampaignsV2":
+            if "ids" in params:
+                return 200, self.batch(data.campaigns, parse_list(params["ids"]))
+            self.check_account(params.get("search.account.values[0]"))
+            return 200, offset_page(data.campaigns, params, self.server.max_page_size, self.server.paging_total)
+
+        if path in ("/rest/adCampaigns", "/rest/creatives"):
+            self.check_account(params.get("account"))
+            elements = data.campaigns if path == "/rest/adCampaigns" else data.creatives
+            return 200, cursor_page(elements, params, self.server.max_page_size)
+
+        match = BATCH_PATH.match(path)
+        if match:
+            elements = data.campaigns if match.group(2) == "adCampaigns" else data.creatives
+            return 200, self.batch(elements, parse_list(params["ids"]))
+
+        if path == "/rest/adAnalytics":
+            self.check_account(params.get("accounts"))
+            if params.get("pivot") != "CAMPAIGN,CREATIVE":
+                raise ValueError("only pivot=CAMPAIGN,CREATIVE is mocked")
+            start, end = parse_date_range(params)
+            fields = tuple(sorted(f for f in params.get("fields", "").split(",") if f))
+            records = data.analytics(start, end, params.get("timeGranularity", "ALL"), fields)
+            return 200, offset_page(records, params, self.server.max_page_size, self.server.paging_total)
+
+        return 404, {"status": 404, "message": f"Resource {path} does not exist"}
+
+    def check_account(self, value: Optional[str]):
+        match = ACCOUNT_URN.search(value or "")
+        if not match or match.group(1) != self.server.data.account_id:
+            raise ValueError(f"unknown account {value!r}")
+
+    @staticmethod
+    def batch(elements: List[Dict], ids: List[str]) -> Dict:
+        """Batch-get response keyed by the requested ids (numeric or URN)"""
+        by_key = {}
+        for element in elements:
+            by_key[str(element["id"])] = element
+            by_key[str(element["id"]).split(":")[-1]] = element
+        found = {key: by_key[key] for key in ids if key in by_key}
+        return {"results": found, "statuses": {key: 200 if key in found else 404 for key in ids}, "errors": {}}
+
+
+class MockLinkedInAdsServer(ThreadingHTTPServer):
+    """Threaded mock API server; use as a context manager to run it in the background
+
+    Point a client at it with ``base_url=server.url``. ``stats`` counts
+    responses by (path, status). ``max_page_size`` caps the elements per
+    page whatever the client asks for; with ``paging_total=False`` offset
+    pages leave out ``paging.total``.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, data: Optional[MockData] = None, faults: Optional[Faults] = None,
+                 host: str = "127.0.0.1", port: int = 0, valid_tokens: Optional[List[str]] = None,
+                 max_page_size: Optional[int] = None, paging_total: bool = True):
+        super().__init__((host, port), MockHandler)
+        self.data = data or MockData()
+        self.faults = faults or Faults()
+        self.valid_tokens = set(valid_tokens) if valid_tokens is not None else None
+        self.max_page_size = max_page_size
+        self.paging_total = paging_total
+        self.stats = {}  # type: Dict[Tuple[str, int], int]
+        self._stats_lock = threading.Lock()
+        self._thread = None  # type: Optional[threading.Thread]
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, path: str, status: int):
+        with self._stats_lock:
+            self.stats[(path, status)] = self.stats.get((path, status), 0) + 1
+
+    def start(self) -> "MockLinkedInAdsServer":
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main():
+    """Run the mock server in the foreground"""
+    parser = argparse.ArgumentParser(description="Local mock of the LinkedIn Ads API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--account-id", default="507539077")
+    parser.add_argument("--campaigns", type=int, default=10)
+    parser.add_argument("--creatives", type=int, default=100)
+    parser.add_argument("--active-creatives", type=int,
+                        help="creatives with analytics (default: all)")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency, up to this many seconds")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests throttled")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="fraction of requests failing with 5xx")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--max-page-size", type=int, help="cap on elements per page (default: none)")
+    args = parser.parse_args()
+
+    data = MockData(args.campaigns, args.creatives, args.days, args.account_id, args.active_creatives)
+    faults = Faults(args.latency, args.jitter, args.rate_429, args.rate_5xx, args.retry_after, seed=args.seed)
+    server = MockLinkedInAdsServer(data, faults, args.host, args.port, max_page_size=args.max_page_size)
+    print(f"Mock LinkedIn Ads API for account {args.account_id} on {server.url}")
+    print(f"  python linkedin_ads_report.py TOKEN {args.account_id} {args.days} --base-url {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Rate limiting and retry schedule for the LinkedIn Ads clients
+Token buckets per application and per account, plus jittered backoff that honours Retry-After
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second"""
+    
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take one token and return how long to wait before using it
+        
+        The bucket may go into debt, so concurrent callers queue up behind
+        each other instead of all waking at the same moment.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class RateLimiter:
+    """Request budget and retry schedule shared by every client of one application
+    
+    Each request takes a token from the application-wide bucket and from the
+    bucket of its account. Throttled (429) and transient 5xx responses are
+    retried up to ``max_retries`` times, honouring ``Retry-After`` and
+    otherwise backing off exponentially with full jitter. No single wait
+    exceeds ``backoff_max`` seconds, whatever ``Retry-After`` asks for.
+    """
+    
+    def __init__(self, app_rate: Optional[float] = 25.0, account_rate: Optional[float] = 10.0,
+                 max_retries: int = 5, backoff_base: float = 0.5, backoff_max: float = 60.0):
+        self.app_bucket = TokenBucket(app_rate) if app_rate else None
+        self.account_rate = account_rate
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._account_buckets = {}  # account_id -> TokenBucket
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+    
+    def reserve(self, account_id: str) -> float:
+        """Reserve budget for one request and return the delay before sending it"""
+        delay = self.app_bucket.reserve() if self.app_bucket else 0.0
+        if self.account_rate:
+            with self._lock:
+                bucket = self._account_buckets.get(account_id)
+                if bucket is None:
+                    bucket = self._account_buckets[account_id] = TokenBucket(self.account_rate)
+            delay = max(delay, bucket.reserve())
+        self._count(requests=1, throttled_seconds=delay)
+        return delay
+    
+    def should_retry(self, status_code: Optional[int], attempt: int) -> bool:
+        """Whether a response (or a connection error, ``None``) should be retried"""
+        return attempt < self.max_retries and (status_code is None or status_code in RETRY_STATUSES)
+    
+    def retry_delay(self, status_code: Optional[int], attempt: int,
+                    retry_after: Optional[str] = None) -> float:
+        """Return how long to wait before the next attempt and record the retry"""
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        else:
+            delay = min(delay, self.backoff_max)
+        self._count(retries=1, throttled=int(status_code == 429), throttled_seconds=delay)
+        return delay
+    
+    def _count(self, requests: int = 0, retries: int = 0, throttled: int = 0,
+               throttled_seconds: float = 0.0):
+        with self._lock:
+            self.requests += requests
+            self.retries += retries
+            self.throttled += throttled
+            self.throttled_seconds += throttled_seconds
+    
+    def stats(self) -> Dict:
+        """Return request, retry and throttling counters"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "throttled_responses": self.throttled,
+                "throttled_seconds": round(self.throttled_seconds, 3)
+            }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
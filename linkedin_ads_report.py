@@ -5,127 +5,385 @@ Fetches campaigns, creatives, landing pages, and click data from LinkedIn Ads AP
 """
 
 import requests
+import argparse
+import gzip
+import heapq
+import io
+import itertools
 import json
+import logging
+import operator
+import os
 import sys
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import urlsplit
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import csv
 
+from linkedin_ads_auth import TokenCheckCache
+from linkedin_ads_cache import ResponseCache, SQLiteResponseCache, cache_key
+from linkedin_ads_instrumentation import (
+    HistogramSink,
+    Instrumentation,
+    JSONLinesSink,
+    PrometheusTextfileSink,
+    TimingHTTPAdapter,
+    current_phases,
+    reset_phases,
+)
+# Metrics, rate limiting and summary helpers are re-exported so existing
+# ``from linkedin_ads_report import ...`` imports keep working
+from linkedin_ads_metrics import (
+    DEFAULT_METRICS,
+    DERIVED_METRICS,
+    ENTITY_COLUMNS,
+    METRICS,
+    REPORT_COLUMNS,
+    REQUIRED_METRICS,
+    analytics_fields,
+    metric_number,
+    ratio,
+    report_columns,
+    resolve_metrics,
+)
+from linkedin_ads_ratelimit import RETRY_STATUSES, RateLimiter, TokenBucket, parse_retry_after
+from linkedin_ads_state import AnalyticsStore
+from linkedin_ads_summary import DistinctCounter, HyperLogLog, SummaryAccumulator, summarize_report
+from linkedin_ads_urn import entity_id, parse_urn, urn_id
 
-class LinkedInAdsClient:
-    """Client for LinkedIn Ads API"""
+
+logger = logging.getLogger("linkedin_ads")
+
+
+# Pagination styles: Rest.li offset paging (start/count) and cursor paging
+# (pageSize/pageToken, used by the newer /rest search finders)
+PAGING_OFFSET = "offset"
+PAGING_CURSOR = "cursor"
+
+
+class LinkedInAPIError(Exception):
+    """Raised when the LinkedIn API returns a non-200 response"""
+    
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"HTTP {status_code}: {text[:200]}")
+        self.status_code = status_code
+        self.text = text
+
+
+class AuthenticationError(LinkedInAPIError):
+    """Raised when the access token is rejected (401/403) before any call has succeeded"""
+
+
+def first_page_params(params: Dict, paging: str, page_size: int) -> Dict:
+    """Return request params for the first page of a collection"""
+    if paging == PAGING_CURSOR:
+        return {**params, "pageSize": page_size}
+    return {**params, "start": 0, "count": page_size}
+
+
+def next_page_params(params: Dict, data: Dict) -> Optional[Dict]:
+    """Return request params for the page after ``data``, or None if it was the last"""
+    elements = data.get("elements", [])
+    if not elements:
+        return None
+    
+    # Cursor paging: follow the token until the API stops returning one
+    next_token = data.get("metadata", {}).get("nextPageToken")
+    if next_token:
+        return {**params, "pageToken": next_token}
+    if "pageSize" in params:
+        return None
     
-    def __init__(self, access_token: str, account_id: str):
+    # Offset paging: stop at the reported total, or if there is none, on a page
+    # shorter than the page size the server used (it may cap the requested count)
+    paging = data.get("paging", {})
+    start = paging.get("start", params.get("start", 0)) + len(elements)
+    total = paging.get("total")
+    if total is not None:
+        if start >= total:
+            return None
+    elif len(elements) < (paging.get("count") or params.get("count") or len(elements) + 1):
+        return None
+    return {**params, "start": start}
+
+
+def offset_page_params(params: Dict, data: Dict) -> List[Dict]:
+    """Return request params for every remaining offset page after the first one
+    
+    Only possible when the first page reports ``paging.total`` and came back
+    full; otherwise the pages have to be walked one by one with
+    ``next_page_params``. The server may cap the page size below the
+    requested ``count``, so offsets step by the size it actually returned.
+    """
+    paging = data.get("paging", {})
+    total = paging.get("total")
+    returned = len(data.get("elements", []))
+    if total is None or not returned or "pageSize" in params:
+        return []
+    if returned < (paging.get("count") or params.get("count") or returned):
+        return []
+    first = paging.get("start", params.get("start", 0)) + returned
+    return [{**params, "start": start, "count": returned} for start in range(first, total, returned)]
+
+
+class EndpointPreferences:
+    """Remembers which endpoint variant (v2 or /rest) works for each resource
+    
+    Clients try the remembered variant first and only fall back to the others
+    when it fails. Preferences live for the lifetime of this object; with a
+    ``path`` they are also persisted as JSON and reused by later runs until
+    they are older than ``ttl`` seconds.
+    """
+    
+    def __init__(self, path: Optional[str] = None, ttl: float = 7 * 24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._preferred = {}  # resource -> {"url": ..., "recorded_at": ...}
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+    
+    def _load(self):
+        """Read unexpired preferences from disk, ignoring a missing or corrupt file"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        self._preferred = {
+            resource: entry for resource, entry in stored.items()
+            if now - entry.get("recorded_at", 0) < self.ttl
+        }
+    
+    def _save(self):
+        """Write preferences to disk atomically"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._preferred, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not save endpoint preferences: %s", e)
+    
+    def _url(self, resource: str) -> Optional[str]:
+        entry = self._preferred.get(resource)
+        return entry["url"] if entry else None
+    
+    def get(self, resource: str) -> Optional[str]:
+        """Return the preferred endpoint URL for a resource, if any"""
+        with self._lock:
+            return self._url(resource)
+    
+    def order(self, resource: str, endpoints: List[Tuple[str, Dict, str]]) -> List[Tuple[str, Dict, str]]:
+        """Return the endpoint variants with the preferred one first"""
+        preferred = self.get(resource)
+        return sorted(endpoints, key=lambda endpoint: endpoint[0] != preferred)
+    
+    def record(self, resource: str, url: str):
+        """Remember that ``url`` worked for ``resource``"""
+        with self._lock:
+            if self._url(resource) == url:
+                return
+            self._preferred[resource] = {"url": url, "recorded_at": time.time()}
+            self._save()
+    
+    def forget(self, resource: str, url: str):
+        """Drop the preference for ``resource`` if it points at a failing ``url``"""
+        with self._lock:
+            if self._url(resource) != url:
+                return
+            del self._preferred[resource]
+            self._save()
+
+
+# Responses rejecting the access token itself
+AUTH_STATUSES = (401, 403)
+
+
+# Default response cache TTLs in seconds per resource; resources not listed
+# (analytics) are never cached
+DEFAULT_CACHE_TTLS = {"campaigns": 3600, "creatives": 3600}
+
+# Entities requested per batch-get call (ids=List(...))
+BATCH_GET_SIZE = 100
+
+# Analytics pivot used for the report: one record per (campaign, creative)
+ANALYTICS_PIVOT = "CAMPAIGN,CREATIVE"
+
+# Analytics API fields that hold metrics, summed when records are merged
+METRIC_API_FIELDS = {api_field for api_field, _ in METRICS.values()}
+
+# Analytics chunk sizes accepted by split_date_range (or a number of days)
+CHUNK_SIZES = ("day", "week", "month")
+
+
+def analytics_date_range(days: int) -> Tuple[date, date]:
+    """Return the (start, end) dates covering the last N days"""
+    end_date = date.today()
+    return end_date - timedelta(days=days), end_date
+
+
+def split_date_range(start_date: date, end_date: date, chunk) -> List[Tuple[date, date]]:
+    """Split an inclusive date range into consecutive windows
+    
+    ``chunk`` is "day", "week", "month" (calendar months) or a number of days.
+    """
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        if chunk == "month":
+            next_month = (window_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+            window_end = next_month - timedelta(days=1)
+        else:
+            length = {"day": 1, "week": 7}.get(chunk, chunk)
+            window_end = window_start + timedelta(days=int(length) - 1)
+        window_end = min(window_end, end_date)
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+    return windows
+
+
+def merge_analytics(chunks: List[List[Dict]], by_date: bool = True) -> List[Dict]:
+    """Merge analytics records from several windows, summing metrics per pivot values
+    
+    Records carrying a ``dateRange`` (time granularity DAILY/MONTHLY) stay
+    separate per period unless ``by_date`` is False, in which case periods
+    are summed into one total and the ``dateRange`` is dropped.
+    """
+    merged = {}
+    for elements in chunks:
+        for item in elements:
+            key = tuple(item.get("pivotValues", []))
+            if by_date:
+                key += (json.dumps(item.get("dateRange"), sort_keys=True),)
+            total = merged.get(key)
+            if total is None:
+                merged[key] = dict(item)
+                if not by_date:
+                    merged[key].pop("dateRange", None)
+                continue
+            for field, value in item.items():
+                if field in METRIC_API_FIELDS:
+                    total[field] = metric_number(total.get(field)) + metric_number(value)
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    total[field] = total.get(field, 0) + value
+    return list(merged.values())
+
+
+def create_session(pool_size: int = 10) -> requests.Session:
+    """Create a keep-alive HTTP session with a connection pool of the given size
+    
+    New connections record their connect/TLS timings for instrumentation.
+    """
+    session = requests.Session()
+    adapter = TimingHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+class BaseLinkedInAdsClient:
+    """Account configuration and endpoint definitions shared by the sync and async clients"""
+    
+    def __init__(self, access_token: str, account_id: str, page_size: int = 100,
+                 endpoint_preferences: Optional[EndpointPreferences] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 analytics_chunk=None, chunk_workers: int = 4, chunk_retries: int = 2,
+                 state_store: Optional[AnalyticsStore] = None, restatement_days: int = 2,
+                 metrics: Optional[List[str]] = None, base_url: str = "https://api.linkedin.com"):
         self.access_token = access_token
         self.account_id = account_id
-        self.base_url = "https://api.linkedin.com"
+        # Overridable to point the client at a local mock (see linkedin_ads_mock)
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+        # Long analytics ranges are split into windows of this size ("day",
+        # "week", "month" or a number of days), fetched concurrently and merged
+        self.analytics_chunk = analytics_chunk
+        self.chunk_workers = chunk_workers
+        self.chunk_retries = chunk_retries
+        # Incremental mode: daily records are kept in this store and only new
+        # days plus a restatement lookback are fetched on each run
+        self.state_store = state_store
+        self.restatement_days = restatement_days
+        # Report metric columns; only their analytics fields are requested
+        self.metrics = resolve_metrics(metrics)
+        self.endpoint_preferences = endpoint_preferences or EndpointPreferences()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # Request and stage events; without sinks nothing is recorded
+        self.instrumentation = Instrumentation()
+        # Log records carry the account, for batch runs and JSON logs
+        self.log = logging.LoggerAdapter(logger, {"account_id": account_id})
         self.headers = {
             "Authorization": f"Bearer {access_token}",
             "X-Restli-Protocol-Version": "2.0.0",
             "LinkedIn-Version": "202411"
         }
     
-    def test_connection(self) -> bool:
-        """Test if the access token is valid"""
-        url = f"{self.base_url}/v2/me"
-        try:
-            print("Testing API connection...")
-            response = requests.get(url, headers=self.headers)
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✓ Connected as: {data.get('localizedFirstName', '')} {data.get('localizedLastName', '')}")
-                return True
-            else:
-                print(f"✗ Connection failed: {response.status_code}")
-                print(f"  Response: {response.text}")
-                return False
-        except requests.exceptions.RequestException as e:
-            print(f"✗ Connection error: {e}")
-            return False
-    
-    def get_campaigns(self) -> List[Dict]:
-        """Fetch all campaigns for the account"""
-        # Try multiple endpoint formats
-        endpoints = [
+    def _campaign_endpoints(self) -> List[Tuple[str, Dict, str]]:
+        """Campaign endpoint variants in the order they should be tried"""
+        return [
             (f"{self.base_url}/v2/adCampaignsV2", {
                 "q": "search",
                 "search.account.values[0]": f"urn:li:sponsoredAccount:{self.account_id}"
-            }),
+            }, PAGING_OFFSET),
             (f"{self.base_url}/rest/adCampaigns", {
                 "q": "account",
                 "account": f"urn:li:sponsoredAccount:{self.account_id}"
-            })
+            }, PAGING_CURSOR)
         ]
-        
-        for url, params in endpoints:
-            try:
-                print(f"  Trying: {url}")
-                response = requests.get(url, headers=self.headers, params=params)
-                print(f"  Status: {response.status_code}")
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    elements = data.get("elements", [])
-                    if elements:
-                        print(f"  ✓ Success! Found {len(elements)} campaigns")
-                        return elements
-                else:
-                    print(f"  Response: {response.text[:200]}")
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"  Error: {e}")
-                continue
-        
-        print("  ✗ All campaign endpoints failed")
-        return []
     
-    def get_creatives(self) -> List[Dict]:
-        """Fetch all creatives (ads) for the account"""
-        # Try multiple endpoint formats
-        endpoints = [
+    def _creative_endpoints(self) -> List[Tuple[str, Dict, str]]:
+        """Creative endpoint variants in the order they should be tried"""
+        return [
             (f"{self.base_url}/v2/adCreativesV2", {
                 "q": "search",
                 "search.account.values[0]": f"urn:li:sponsoredAccount:{self.account_id}"
-            }),
+            }, PAGING_OFFSET),
             (f"{self.base_url}/rest/creatives", {
                 "q": "account",
                 "account": f"urn:li:sponsoredAccount:{self.account_id}"
-            })
+            }, PAGING_CURSOR)
         ]
-        
-        for url, params in endpoints:
-            try:
-                print(f"  Trying: {url}")
-                response = requests.get(url, headers=self.headers, params=params)
-                print(f"  Status: {response.status_code}")
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    elements = data.get("elements", [])
-                    if elements:
-                        print(f"  ✓ Success! Found {len(elements)} creatives")
-                        return elements
-                else:
-                    print(f"  Response: {response.text[:200]}")
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"  Error: {e}")
-                continue
-        
-        print("  ✗ All creative endpoints failed")
-        return []
     
-    def get_analytics(self, days: int = 7) -> List[Dict]:
-        """Fetch analytics data for the last N days"""
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
+    def _campaign_batch_endpoints(self, urns: List[str]) -> List[Tuple[str, Dict]]:
+        """Batch-get variants fetching the given campaign URNs by id"""
+        ids = f"List({','.join(str(urn_id(urn)) for urn in urns)})"
+        return [
+            (f"{self.base_url}/v2/adCampaignsV2", {"ids": ids}),
+            (f"{self.base_url}/rest/adAccounts/{self.account_id}/adCampaigns", {"ids": ids})
+        ]
+    
+    def _creative_batch_endpoints(self, urns: List[str]) -> List[Tuple[str, Dict]]:
+        """Batch-get variants fetching the given creative URNs (v2 by numeric id, REST by URN)"""
+        return [
+            (f"{self.base_url}/v2/adCreativesV2",
+             {"ids": f"List({','.join(str(urn_id(urn)) for urn in urns)})"}),
+            (f"{self.base_url}/rest/adAccounts/{self.account_id}/creatives",
+             {"ids": f"List({','.join(urns)})"})
+        ]
+    
+    def _analytics_endpoints(self, start_date: date, end_date: date,
+                             granularity: Optional[str] = None) -> List[Tuple[str, Dict, str]]:
+        """Analytics endpoint variants for an inclusive date range
         
-        # Try multiple endpoint formats
+        With a ``granularity`` (DAILY, MONTHLY) each record covers one period
+        and carries its ``dateRange``.
+        """
+        fields = analytics_fields(self.metrics) + (",dateRange" if granularity else "")
         endpoints = [
             # v2 format
             (f"{self.base_url}/v2/adAnalyticsV2", {
                 "q": "analytics",
-                "pivot": "CAMPAIGN,CREATIVE",
+                "pivot": ANALYTICS_PIVOT,
                 "dateRange.start.day": start_date.day,
                 "dateRange.start.month": start_date.month,
                 "dateRange.start.year": start_date.year,
@@ -133,44 +391,31 @@ class LinkedInAdsClient:
                 "dateRange.end.month": end_date.month,
                 "dateRange.end.year": end_date.year,
                 "accounts[0]": f"urn:li:sponsoredAccount:{self.account_id}",
-                "fields": "clicks,impressions,landingPageClicks,pivotValues"
-            }),
+                "fields": fields
+            }, PAGING_OFFSET),
             # REST format
             (f"{self.base_url}/rest/adAnalytics", {
                 "q": "analytics",
-                "pivot": "CAMPAIGN,CREATIVE",
+                "pivot": ANALYTICS_PIVOT,
                 "dateRange": f"(start:(day:{start_date.day},month:{start_date.month},year:{start_date.year}),"
                             f"end:(day:{end_date.day},month:{end_date.month},year:{end_date.year}))",
                 "accounts": f"List(urn:li:sponsoredAccount:{self.account_id})",
-                "fields": "clicks,impressions,landingPageClicks,pivotValues"
-            })
+                "fields": fields
+            }, PAGING_OFFSET)
         ]
-        
-        for url, params in endpoints:
-            try:
-                print(f"  Trying: {url}")
-                response = requests.get(url, headers=self.headers, params=params)
-                print(f"  Status: {response.status_code}")
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    elements = data.get("elements", [])
-                    if elements:
-                        print(f"  ✓ Success! Found {len(elements)} analytics records")
-                        return elements
-                else:
-                    print(f"  Response: {response.text[:200]}")
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"  Error: {e}")
-                continue
-        
-        print("  ✗ All analytics endpoints failed")
-        return []
+        if granularity:
+            for _, params, _ in endpoints:
+                params["timeGranularity"] = granularity
+        return endpoints
     
     def extract_landing_page(self, creative: Dict) -> Optional[str]:
-        """Extract landing page URL from creative content"""
-        content = creative.get("content", {})
+        """Extract landing page URL from creative content
+        
+        Covers the v2 ad format structures and the REST shapes: an inline
+        ``content.reference``, ``directSponsoredContent`` and multi-card
+        carousels (the first card with a landing page wins).
+        """
+        content = creative.get("content") or {}
         
         # Try different ad format structures
         for ad_type in ["sponsoredContent", "textAd", "spotlight", "sponsoredVideo", "carousel"]:
@@ -179,57 +424,719 @@ class LinkedInAdsClient:
                 if landing_page:
                     return landing_page
         
-        return None
+        # REST: a post reference is only a URN, but may be expanded inline
+        reference = content.get("reference")
+        if isinstance(reference, dict):
+            landing_page = reference.get("landingPage") or reference.get("url")
+            if landing_page:
+                return landing_page
+        
+        direct = creative.get("directSponsoredContent") or content.get("directSponsoredContent")
+        if isinstance(direct, dict):
+            landing_page = direct.get("landingPage") or (direct.get("article") or {}).get("source")
+            if landing_page:
+                return landing_page
+        
+        for ad_type in ["carousel", "multiImage"]:
+            for card in (content.get(ad_type) or {}).get("cards", []):
+                landing_page = card.get("landingPage")
+                if landing_page:
+                    return landing_page
+        
+        return creative.get("landingPage")
+    
+    def landing_page_index(self, creatives_map: Dict) -> Dict:
+        """Map each creative id to its landing page (None if it has none)
+        
+        Built once per set of creatives, so the join and the exports look
+        landing pages up instead of walking creative content per row.
+        """
+        return {key: self.extract_landing_page(creative) for key, creative in creatives_map.items()}
 
 
-def generate_report(client: LinkedInAdsClient, days: int = 7):
-    """Generate comprehensive ads performance report"""
+class LinkedInAdsClient(BaseLinkedInAdsClient):
+    """Client for LinkedIn Ads API
     
-    print(f"Fetching LinkedIn Ads data for the last {days} days...")
+    All requests go through a single pooled ``requests.Session`` so TCP/TLS
+    connections are reused across calls. Use the client as a context manager
+    (or call ``close()``) to release the pool when done.
+    
+    Collection endpoints are paginated: ``iter_*`` methods stream elements
+    page by page and ``get_*`` methods collect them into a list.
+    """
+    
+    def __init__(self, access_token: str, account_id: str,
+                 pool_size: int = 10, timeout: Optional[float] = 30.0,
+                 session: Optional[requests.Session] = None, page_size: int = 100,
+                 endpoint_preferences: Optional[EndpointPreferences] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 analytics_chunk=None, chunk_workers: int = 4, chunk_retries: int = 2,
+                 state_store: Optional[AnalyticsStore] = None, restatement_days: int = 2,
+                 response_cache: Optional[ResponseCache] = None,
+                 cache_ttls: Optional[Dict[str, float]] = None,
+                 metrics: Optional[List[str]] = None, referenced_only: bool = False,
+                 base_url: str = "https://api.linkedin.com",
+                 instrumentation: Optional[Instrumentation] = None,
+                 lazy_auth: bool = False, auth_cache: Optional[TokenCheckCache] = None):
+        super().__init__(access_token, account_id, page_size, endpoint_preferences, rate_limiter,
+                         analytics_chunk, chunk_workers, chunk_retries, state_store, restatement_days,
+                         metrics, base_url)
+        self.timeout = timeout
+        # With lazy_auth the token is not probed up front; a 401/403 before
+        # any call has succeeded raises AuthenticationError instead
+        self.lazy_auth = lazy_auth
+        self.auth_cache = auth_cache
+        self.auth_confirmed = False
+        # Fetch analytics first and batch-get only the campaigns and creatives
+        # they reference, instead of listing every entity on the account
+        self.referenced_only = referenced_only
+        if instrumentation is not None:
+            self.instrumentation = instrumentation
+        # Metadata responses are cached per resource for cache_ttls seconds and
+        # revalidated with If-None-Match/If-Modified-Since once stale
+        self.response_cache = response_cache
+        self.cache_ttls = DEFAULT_CACHE_TTLS if cache_ttls is None else cache_ttls
+        # A caller-supplied session is shared (e.g. across accounts) and is not
+        # closed by this client
+        self._owns_session = session is None
+        self.session = session if session is not None else create_session(pool_size)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Close the underlying HTTP session if this client created it"""
+        if self._owns_session:
+            self.session.close()
+    
+    def _get(self, url: str, params: Optional[Dict] = None,
+             headers: Optional[Dict] = None) -> requests.Response:
+        """Send a GET request through the pooled session, within the rate limit
+        
+        Throttled and transient failures are retried per the rate limiter;
+        the last response (or connection error) is returned once retries run out.
+        Every attempt is recorded with ``instrumentation``.
+        """
+        attempt = 0
+        while True:
+            time.sleep(self.rate_limiter.reserve(self.account_id))
+            reset_phases()
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, headers={**self.headers, **(headers or {})},
+                                            params=params, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                retry = self.rate_limiter.should_retry(None, attempt)
+                self._record_request(url, None, attempt, retry, started, error=type(e).__name__)
+                if not retry:
+                    raise
+                time.sleep(self.rate_limiter.retry_delay(None, attempt))
+            else:
+                retry = self.rate_limiter.should_retry(response.status_code, attempt)
+                self._record_request(url, response, attempt, retry, started)
+                if not retry:
+                    return response
+                time.sleep(self.rate_limiter.retry_delay(
+                    response.status_code, attempt, response.headers.get("Retry-After")))
+            attempt += 1
+    
+    def _record_request(self, url: str, response: Optional[requests.Response], attempt: int,
+                        retry: bool, started: float, error: Optional[str] = None):
+        """Emit one request event: endpoint, variant, status, bytes, timings and retry state"""
+        if not self.instrumentation.enabled:
+            return
+        total = time.perf_counter() - started
+        connect, tls = current_phases()
+        path = urlsplit(url).path
+        self.instrumentation.request(
+            account_id=self.account_id,
+            endpoint=path,
+            variant=path.split("/")[1] if path.count("/") > 1 else "",
+            status=response.status_code if response is not None else None,
+            bytes=len(response.content) if response is not None else 0,
+            attempt=attempt,
+            retry=retry,
+            connect=connect,
+            tls=tls,
+            # requests measures from sending the request to parsing the response headers
+            ttfb=response.elapsed.total_seconds() if response is not None else None,
+            total=total,
+            error=error
+        )
+    
+    def test_connection(self) -> bool:
+        """Test if the access token is valid
+        
+        A token that passed within the ``auth_cache`` TTL is trusted without
+        a request; the first real call then validates it, as with ``lazy_auth``.
+        """
+        checked_at = self.auth_cache.checked_at(self.access_token) if self.auth_cache is not None else None
+        if checked_at is not None:
+            self.log.info("✓ Token verified %d minutes ago, skipping connection test",
+                          (time.time() - checked_at) // 60)
+            self.lazy_auth = True
+            return True
+        
+        url = f"{self.base_url}/v2/me"
+        try:
+            self.log.info("Testing API connection...")
+            response = self._get(url)
+            if response.status_code == 200:
+                self._confirm_auth()
+                data = response.json()
+                self.log.info("✓ Connected as: %s %s", data.get("localizedFirstName", ""),
+                              data.get("localizedLastName", ""))
+                return True
+            else:
+                self.log.error("✗ Connection failed: %s\n  Response: %s", response.status_code, response.text)
+                return False
+        except requests.exceptions.RequestException as e:
+            self.log.error("✗ Connection error: %s", e)
+            return False
+    
+    def _confirm_auth(self):
+        self.auth_confirmed = True
+        if self.auth_cache is not None:
+            self.auth_cache.record(self.access_token)
+    
+    def _check_auth(self, response: requests.Response):
+        """Validate the token lazily from the first real response
+        
+        A 401/403 before anything has succeeded means the token itself is
+        expired, revoked or missing scopes, so every endpoint variant would
+        fail the same way: raise ``AuthenticationError`` instead of falling back.
+        """
+        if not self.lazy_auth or self.auth_confirmed:
+            return
+        if response.status_code in (200, 304):
+            self._confirm_auth()
+        elif response.status_code in AUTH_STATUSES:
+            if self.auth_cache is not None:
+                self.auth_cache.forget(self.access_token)
+            raise AuthenticationError(response.status_code, response.text)
+    
+    def _get_json(self, resource: str, url: str, params: Dict) -> Dict:
+        """Fetch a JSON page, serving it from the response cache when possible
+        
+        Fresh cache entries are returned without a request. Stale entries are
+        revalidated with their ETag/Last-Modified; a 304 keeps the cached body.
+        """
+        ttl = self.cache_ttls.get(resource) if self.response_cache is not None else None
+        if not ttl:
+            response = self._get(url, params)
+            self._check_auth(response)
+            if response.status_code != 200:
+                raise LinkedInAPIError(response.status_code, response.text)
+            return response.json()
+        
+        key = cache_key(url, params, self.headers["LinkedIn-Version"], self.access_token)
+        entry = self.response_cache.get(key)
+        headers = {}
+        if entry is not None:
+            if time.time() - entry["stored_at"] < ttl:
+                return entry["data"]
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        
+        response = self._get(url, params, headers)
+        self._check_auth(response)
+        if response.status_code == 304 and entry is not None:
+            self.response_cache.touch(key)
+            return entry["data"]
+        if response.status_code != 200:
+            raise LinkedInAPIError(response.status_code, response.text)
+        data = response.json()
+        self.response_cache.set(key, {
+            "data": data,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "stored_at": time.time()
+        })
+        return data
+    
+    def _paginate(self, resource: str, url: str, params: Dict, paging: str,
+                  page_size: int) -> Iterator[List[Dict]]:
+        """Yield the elements of each page of a collection endpoint"""
+        page_params = first_page_params(params, paging, page_size)
+        while page_params is not None:
+            data = self._get_json(resource, url, page_params)
+            yield data.get("elements", [])
+            page_params = next_page_params(page_params, data)
+    
+    def _iter_elements(self, resource: str, endpoints: List[Tuple[str, Dict, str]],
+                       page_size: Optional[int] = None, strict: bool = False) -> Iterator[Dict]:
+        """Stream elements from the first endpoint variant that returns data
+        
+        With ``strict``, errors are raised instead of reported: a failure part
+        way through pagination, or every variant failing without any of them
+        answering 200, raises the last error so the caller can retry.
+        """
+        page_size = page_size or self.page_size
+        last_error = None
+        answered = False
+        
+        for url, params, paging in self.endpoint_preferences.order(resource, endpoints):
+            self.log.debug("  Trying: %s", url)
+            pages = self._paginate(resource, url, params, paging, page_size)
+            try:
+                elements = next(pages, [])
+            except AuthenticationError:
+                raise
+            except LinkedInAPIError as e:
+                self.log.debug("  Status: %s\n  Response: %.200s", e.status_code, e.text)
+                if e.status_code not in RETRY_STATUSES:
+                    self.endpoint_preferences.forget(resource, url)
+                last_error = e
+                continue
+            except requests.exceptions.RequestException as e:
+                self.log.debug("  Error: %s", e)
+                last_error = e
+                continue
+            
+            self.log.debug("  Status: 200")
+            answered = True
+            if not elements:
+                continue
+            
+            self.endpoint_preferences.record(resource, url)
+            count = len(elements)
+            yield from elements
+            try:
+                for elements in pages:
+                    count += len(elements)
+                    yield from elements
+            except (LinkedInAPIError, requests.exceptions.RequestException) as e:
+                if strict:
+                    raise
+                self.log.warning("  ✗ Pagination stopped after %d %s: %s", count, resource, e)
+            self.log.info("  ✓ Success! Found %d %s", count, resource)
+            return
+        
+        if strict and not answered and last_error is not None:
+            raise last_error
+        self.log.warning("  ✗ All %s endpoints failed", resource)
+    
+    def iter_campaigns(self, page_size: Optional[int] = None) -> Iterator[Dict]:
+        """Stream all campaigns for the account, page by page"""
+        return self._iter_elements("campaigns", self._campaign_endpoints(), page_size)
+    
+    def iter_creatives(self, page_size: Optional[int] = None) -> Iterator[Dict]:
+        """Stream all creatives (ads) for the account, page by page"""
+        return self._iter_elements("creatives", self._creative_endpoints(), page_size)
+    
+    def iter_analytics(self, days: int = 7, page_size: Optional[int] = None) -> Iterator[Dict]:
+        """Stream analytics data for the last N days, page by page
+        
+        Chunked and incremental fetches have to merge records before they can
+        be returned, so with either enabled this yields from ``get_analytics``.
+        """
+        if self.state_store is not None or self.analytics_chunk:
+            return iter(self.get_analytics(days, page_size))
+        start_date, end_date = analytics_date_range(days)
+        return self._iter_elements("analytics records", self._analytics_endpoints(start_date, end_date), page_size)
+    
+    def get_campaigns(self, page_size: Optional[int] = None) -> List[Dict]:
+        """Fetch all campaigns for the account"""
+        return list(self.iter_campaigns(page_size))
+    
+    def get_creatives(self, page_size: Optional[int] = None) -> List[Dict]:
+        """Fetch all creatives (ads) for the account"""
+        return list(self.iter_creatives(page_size))
+    
+    def _batch_get(self, resource: str, endpoints: List[Tuple[str, Dict]]) -> Dict[str, Dict]:
+        """Fetch one batch-get from the first endpoint variant that answers
+        
+        Returns the ``results`` map keyed as the API returned it (numeric id
+        or URN), or an empty dict if every variant failed.
+        """
+        preference = f"{resource} by id"
+        for url, params in self.endpoint_preferences.order(preference, endpoints):
+            try:
+                data = self._get_json(resource, url, params)
+            except AuthenticationError:
+                raise
+            except LinkedInAPIError as e:
+                self.log.debug("  Batch %s %s: %s\n  Response: %.200s", resource, url, e.status_code, e.text)
+                if e.status_code not in RETRY_STATUSES:
+                    self.endpoint_preferences.forget(preference, url)
+                continue
+            except requests.exceptions.RequestException as e:
+                self.log.debug("  Batch %s %s: %s", resource, url, e)
+                continue
+            self.endpoint_preferences.record(preference, url)
+            return data.get("results", {})
+        self.log.warning("  ✗ All %s batch endpoints failed", resource)
+        return {}
+    
+    def get_entities_by_urn(self, resource: str, urns: Iterable[str],
+                            batch_size: int = BATCH_GET_SIZE) -> Dict[str, Dict]:
+        """Batch-get campaigns or creatives by URN and return them keyed by URN
+        
+        ``resource`` is "campaigns" or "creatives". URNs are requested in
+        batches of ``batch_size``, ``chunk_workers`` batches at a time; URNs
+        the API does not return are left out.
+        """
+        endpoints = {"campaigns": self._campaign_batch_endpoints,
+                     "creatives": self._creative_batch_endpoints}[resource]
+        # Sorted so the same URNs always make the same (cacheable) requests
+        urns = sorted({urn for urn in urns if urn})
+        batches = [urns[i:i + batch_size] for i in range(0, len(urns), batch_size)]
+        self.log.info("  Fetching %d %s by id in %d batches", len(urns), resource, len(batches))
+        
+        def fetch(batch: List[str]) -> Dict[str, Dict]:
+            urn_for_key = {}
+            for urn in batch:
+                urn_for_key[urn] = urn
+                urn_for_key[str(parse_urn(urn).id)] = urn
+            results = self._batch_get(resource, endpoints(batch))
+            return {urn_for_key[key]: entity for key, entity in results.items() if key in urn_for_key}
+        
+        entities = {}
+        # Probe the endpoint variants with one batch before fanning out
+        if batches and self.endpoint_preferences.get(f"{resource} by id") is None:
+            entities.update(fetch(batches[0]))
+            batches = batches[1:]
+        with ThreadPoolExecutor(max_workers=self.chunk_workers) as executor:
+            for found in executor.map(fetch, batches):
+                entities.update(found)
+        self.log.info("  ✓ Found %d of %d %s", len(entities), len(urns), resource)
+        return entities
+    
+    def get_analytics(self, days: int = 7, page_size: Optional[int] = None) -> List[Dict]:
+        """Fetch analytics data for the last N days
+        
+        With a ``state_store`` only new days are fetched (see
+        ``sync_analytics``); otherwise the whole range is requested.
+        """
+        if self.state_store is not None:
+            return self.sync_analytics(days, page_size)
+        start_date, end_date = analytics_date_range(days)
+        return self.get_analytics_range(start_date, end_date, page_size)
+    
+    def get_analytics_range(self, start_date: date, end_date: date, page_size: Optional[int] = None,
+                            granularity: Optional[str] = None, strict: bool = False) -> List[Dict]:
+        """Fetch analytics data for an inclusive date range
+        
+        When ``analytics_chunk`` is set the range is fetched as concurrent
+        windows and the results are merged by pivot values. With ``strict``,
+        a range (or window) that cannot be fetched raises instead of being
+        reported and skipped.
+        """
+        windows = split_date_range(start_date, end_date, self.analytics_chunk) if self.analytics_chunk else []
+        if len(windows) <= 1:
+            endpoints = self._analytics_endpoints(start_date, end_date, granularity)
+            return list(self._iter_elements("analytics records", endpoints, page_size, strict))
+        
+        self.log.info("  Splitting %s → %s into %d %s windows", start_date, end_date, len(windows),
+                      self.analytics_chunk)
+        chunks = []
+        # Until the working endpoint variant is known, fetch one window on its
+        # own so the others don't all probe the failing variant in parallel
+        if self.endpoint_preferences.get("analytics records") is None:
+            chunks.append(self._fetch_analytics_window(windows[0], page_size, granularity, strict))
+            windows = windows[1:]
+        with ThreadPoolExecutor(max_workers=self.chunk_workers) as executor:
+            chunks.extend(executor.map(
+                lambda window: self._fetch_analytics_window(window, page_size, granularity, strict),
+                windows
+            ))
+        return merge_analytics(chunks)
+    
+    def _fetch_analytics_window(self, window: Tuple[date, date], page_size: Optional[int] = None,
+                                granularity: Optional[str] = None, strict: bool = False) -> List[Dict]:
+        """Fetch one analytics window, retrying it on its own if it fails"""
+        start_date, end_date = window
+        endpoints = self._analytics_endpoints(start_date, end_date, granularity)
+        for attempt in range(self.chunk_retries + 1):
+            try:
+                return list(self._iter_elements("analytics records", endpoints, page_size, strict=True))
+            except AuthenticationError:
+                raise
+            except (LinkedInAPIError, requests.exceptions.RequestException) as e:
+                self.log.warning("  ✗ Window %s → %s failed (attempt %d): %s", start_date, end_date, attempt + 1, e)
+                if strict and attempt == self.chunk_retries:
+                    raise
+        self.log.error("  ✗ Giving up on window %s → %s", start_date, end_date)
+        return []
+    
+    def sync_analytics(self, days: int = 7, page_size: Optional[int] = None) -> List[Dict]:
+        """Incrementally sync daily analytics into the state store and return N-day totals
+        
+        Only the days after the last synced date, plus ``restatement_days``
+        of lookback for late-arriving corrections, are fetched, along with
+        any days before the first synced date (e.g. after widening ``days``).
+        Records only hold the fields requested when they were synced, so the
+        state is kept per analytics field set and changing ``metrics`` starts
+        a fresh full sync. The report is then rebuilt from the stored daily records. If a fetch
+        fails its days are left untouched and the previously synced data is used.
+        """
+        return merge_analytics([self.sync_daily_analytics(days, page_size)], by_date=False)
+    
+    def sync_daily_analytics(self, days: int = 7, page_size: Optional[int] = None) -> List[Dict]:
+        """Incrementally sync the state store (see ``sync_analytics``) and return the N days of daily records"""
+        start_date, end_date = analytics_date_range(days)
+        pivot = f"{ANALYTICS_PIVOT}:{analytics_fields(self.metrics)}"
+        synced = self.state_store.synced_range(self.account_id, pivot)
+        windows = [(start_date, end_date)]
+        if synced is not None:
+            first_synced, last_synced = synced
+            fetch_start = max(start_date, min(end_date, last_synced - timedelta(days=self.restatement_days)))
+            windows = [(fetch_start, end_date)]
+            backfill_end = min(first_synced, fetch_start) - timedelta(days=1)
+            if start_date <= backfill_end:
+                windows.insert(0, (start_date, backfill_end))
+        
+        for fetch_start, fetch_end in windows:
+            self.log.info("  Syncing %s → %s (synced: %s)", fetch_start, fetch_end,
+                          "%s → %s" % synced if synced else "never")
+            try:
+                records = self.get_analytics_range(fetch_start, fetch_end, page_size, "DAILY", strict=True)
+            except AuthenticationError:
+                raise
+            except (LinkedInAPIError, requests.exceptions.RequestException) as e:
+                self.log.warning("  ✗ Sync failed, using stored data: %s", e)
+            else:
+                self.state_store.save_days(self.account_id, pivot, fetch_start, fetch_end, records)
+        
+        return self.state_store.load(self.account_id, pivot, start_date, end_date)
+    
+    def get_analytics_series(self, days: int = 7, granularity: str = "DAILY",
+                             page_size: Optional[int] = None):
+        """Fetch analytics for the last N days as an ``AnalyticsTimeSeries``
+        
+        Records are requested with ``timeGranularity`` set to ``granularity``
+        (DAILY or MONTHLY). With a ``state_store`` the stored daily records
+        are synced and binned instead, so no extra request is needed.
+        """
+        from linkedin_ads_timeseries import AnalyticsTimeSeries
+        
+        start_date, end_date = analytics_date_range(days)
+        if self.state_store is not None:
+            records = self.sync_daily_analytics(days, page_size)
+        else:
+            records = self.get_analytics_range(start_date, end_date, page_size, granularity)
+        return AnalyticsTimeSeries.from_records(records, start_date, end_date, granularity, self.metrics)
+
+def build_maps(campaigns: List[Dict], creatives: List[Dict]) -> Tuple[Dict, Dict]:
+    """Index campaigns and creatives by id (an int for numeric ids, whether given as URN or number)"""
+    return {entity_id(c.get("id")): c for c in campaigns}, {entity_id(c.get("id")): c for c in creatives}
+
+
+def fetch_report_data(client: LinkedInAdsClient, days: int = 7) -> Tuple[Dict, Dict, List[Dict]]:
+    """Fetch campaigns, creatives and analytics for a report"""
+    
+    client.log.info("Fetching LinkedIn Ads data for the last %d days...", days)
+    
+    if client.referenced_only:
+        return fetch_referenced_report_data(client, days)
     
     # Fetch all data
-    print("→ Fetching campaigns...")
-    campaigns = client.get_campaigns()
-    campaigns_map = {c.get("id"): c for c in campaigns}
+    client.log.info("→ Fetching campaigns...")
+    with client.instrumentation.stage("campaigns"):
+        campaigns = client.get_campaigns()
     
-    print("→ Fetching creatives...")
-    creatives = client.get_creatives()
-    creatives_map = {c.get("id"): c for c in creatives}
+    client.log.info("→ Fetching creatives...")
+    with client.instrumentation.stage("creatives"):
+        creatives = client.get_creatives()
+    campaigns_map, creatives_map = build_maps(campaigns, creatives)
     
-    print("→ Fetching analytics...")
-    analytics = client.get_analytics(days)
+    client.log.info("→ Fetching analytics...")
+    with client.instrumentation.stage("analytics"):
+        analytics = client.get_analytics(days)
     
-    # Build report data
-    report_data = []
+    return campaigns_map, creatives_map, analytics
+
+
+def fetch_referenced_report_data(client: LinkedInAdsClient, days: int = 7) -> Tuple[Dict, Dict, List[Dict]]:
+    """Fetch analytics, then batch-get only the campaigns and creatives they reference"""
+    client.log.info("→ Fetching analytics...")
+    with client.instrumentation.stage("analytics"):
+        analytics = client.get_analytics(days)
+    
+    pivots = [item.get("pivotValues", []) for item in analytics]
+    client.log.info("→ Fetching referenced campaigns...")
+    with client.instrumentation.stage("campaigns"):
+        campaigns = client.get_entities_by_urn("campaigns", (p[0] for p in pivots if len(p) >= 2))
+    client.log.info("→ Fetching referenced creatives...")
+    with client.instrumentation.stage("creatives"):
+        creatives = client.get_entities_by_urn("creatives", (p[1] for p in pivots if len(p) >= 2))
+    
+    # Keyed by id like build_maps
+    campaigns_map = {urn_id(urn): campaign for urn, campaign in campaigns.items()}
+    creatives_map = {urn_id(urn): creative for urn, creative in creatives.items()}
+    return campaigns_map, creatives_map, analytics
+
+
+def generate_report(client: LinkedInAdsClient, days: int = 7, engine: str = "python"):
+    """Generate comprehensive ads performance report
+    
+    ``engine="arrow"`` joins and sorts with the vectorized engine (requires
+    pyarrow) and returns the same rows.
+    """
+    campaigns_map, creatives_map, analytics = fetch_report_data(client, days)
+    
+    with client.instrumentation.stage("join"):
+        if engine == "arrow":
+            import linkedin_ads_vectorized
+            return linkedin_ads_vectorized.build_report(client, campaigns_map, creatives_map, analytics)
+        return build_report(client, campaigns_map, creatives_map, analytics)
+
+
+def generate_report_iter(client: LinkedInAdsClient, days: int = 7,
+                         top_n: Optional[int] = None) -> Iterator[Dict]:
+    """Yield report rows as analytics pages arrive, without building the full report
+    
+    Rows come out in API order, which suits unsorted sinks like CSV or
+    Parquet. With ``top_n``, only the ``top_n`` rows with the most clicks are
+    kept (a bounded heap) and yielded in descending order. Entity details
+    are listed up front, so ``referenced_only`` does not apply here.
+    """
+    client.log.info("Fetching LinkedIn Ads data for the last %d days...", days)
+    
+    client.log.info("→ Fetching campaigns...")
+    with client.instrumentation.stage("campaigns"):
+        campaigns = client.get_campaigns()
+    
+    client.log.info("→ Fetching creatives...")
+    with client.instrumentation.stage("creatives"):
+        creatives = client.get_creatives()
+    campaigns_map, creatives_map = build_maps(campaigns, creatives)
+    
+    client.log.info("→ Streaming analytics...")
+    rows = iter_report_rows(client, campaigns_map, creatives_map, client.iter_analytics(days))
+    if top_n is not None:
+        rows = iter(top_report_rows(rows, top_n))
+    yield from rows
+
+
+def top_report_rows(rows: Iterable[Dict], n: int) -> List[Dict]:
+    """Return the ``n`` rows with the most clicks, in memory proportional to ``n``
+    
+    Ties keep their original order, as with a stable sort.
+    """
+    return heapq.nlargest(n, rows, key=lambda x: x["clicks"])
+
+
+class ReportRow(Mapping):
+    """A report row stored in ``__slots__``, readable (and writable) like a dict
+    
+    Subclasses for a given column tuple come from ``report_row_type``; each
+    instance holds one slot per column and no per-row dict, which takes a
+    fraction of the memory of a dict row. ``row["clicks"]``, ``row.get``,
+    ``keys()``/``items()`` and ``**row`` work as for a dict.
+    """
+    __slots__ = ()
+    columns = ()  # type: Tuple[str, ...]
+    _column_set = frozenset()
+    
+    def __init__(self, *values):
+        for name, value in zip(self.columns, values):
+            setattr(self, name, value)
+    
+    def __getitem__(self, key: str):
+        if key not in self._column_set:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __setitem__(self, key: str, value):
+        if key not in self._column_set:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+    
+    def __len__(self) -> int:
+        return len(self.columns)
+    
+    def __repr__(self) -> str:
+        return f"ReportRow({self.to_dict()!r})"
+    
+    def __reduce__(self):
+        return make_report_row, (self.columns, self.astuple())
+    
+    def astuple(self) -> Tuple:
+        """Column values in column order"""
+        return tuple(getattr(self, name) for name in self.columns)
+    
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.columns}
+
+
+@lru_cache(maxsize=None)
+def report_row_type(columns: Tuple[str, ...]) -> type:
+    """Slotted ``ReportRow`` subclass for a column tuple (one class per distinct tuple)"""
+    return type("ReportRow", (ReportRow,), {
+        "__slots__": columns, "columns": columns, "_column_set": frozenset(columns)
+    })
+
+
+def make_report_row(columns: Tuple[str, ...], values: Tuple) -> ReportRow:
+    """Build a report row for a column tuple (also used to unpickle rows)"""
+    return report_row_type(tuple(columns))(*values)
+
+
+def iter_report_rows(client: BaseLinkedInAdsClient, campaigns_map: Dict, creatives_map: Dict,
+                     analytics: Iterable[Dict], landing_pages: Optional[Dict] = None) -> Iterator[ReportRow]:
+    """Join analytics records with campaign and creative details, one row at a time
+    
+    The maps are keyed by id (see ``build_maps``); URNs are parsed once per
+    distinct value, so numeric ids come out as shared ints. Rows are slotted
+    ``ReportRow`` objects with the client's selected metrics, derived ratios
+    included. Landing pages come from ``landing_pages`` (see
+    ``landing_page_index``), built from ``creatives_map`` if not given.
+    """
+    if landing_pages is None:
+        landing_pages = client.landing_page_index(creatives_map)
+    row_type = report_row_type(tuple(report_columns(client.metrics)))
+    # One step per metric column: (api field, cast) for base metrics, or the
+    # positions of the numerator and denominator for derived ones
+    position = {metric: i for i, metric in enumerate(client.metrics)}
+    plan = [METRICS[m] + (None, None) if m in METRICS
+            else (None, None) + tuple(position[c] for c in DERIVED_METRICS[m])
+            for m in client.metrics]
     
     for item in analytics:
         pivot_values = item.get("pivotValues", [])
         if len(pivot_values) >= 2:
-            campaign_urn = pivot_values[0]
-            creative_urn = pivot_values[1]
-            
             # Extract IDs from URNs
-            campaign_id = campaign_urn.split(":")[-1] if campaign_urn else None
-            creative_id = creative_urn.split(":")[-1] if creative_urn else None
+            campaign_id = urn_id(pivot_values[0])
+            creative_id = urn_id(pivot_values[1])
             
             # Get campaign and creative details
-            campaign = campaigns_map.get(campaign_urn, {})
-            creative = creatives_map.get(creative_urn, {})
+            campaign = campaigns_map.get(campaign_id, {})
+            creative = creatives_map.get(creative_id, {})
+            
+            landing_page = landing_pages.get(creative_id)
             
-            # Extract landing page
-            landing_page = client.extract_landing_page(creative)
+            metric_values = []
+            for api_field, cast, numerator, denominator in plan:
+                if api_field is None:
+                    metric_values.append(ratio(metric_values[numerator], metric_values[denominator]))
+                else:
+                    value = item.get(api_field, 0)
+                    metric_values.append(cast(metric_number(value)) if cast else value)
             
-            report_data.append({
-                "campaign_id": campaign_id,
-                "campaign_name": campaign.get("name", "Unknown"),
-                "campaign_status": campaign.get("status", "Unknown"),
-                "creative_id": creative_id,
-                "creative_name": creative.get("name", "Unknown"),
-                "landing_page": landing_page or "N/A",
-                "clicks": item.get("clicks", 0),
-                "impressions": item.get("impressions", 0),
-                "landing_page_clicks": item.get("landingPageClicks", 0)
-            })
+            yield row_type(
+                campaign_id,
+                campaign.get("name", "Unknown"),
+                campaign.get("status", "Unknown"),
+                creative_id,
+                creative.get("name", "Unknown"),
+                landing_page or "N/A",
+                *metric_values
+            )
+
+
+def build_report(client: BaseLinkedInAdsClient, campaigns_map: Dict, creatives_map: Dict,
+                 analytics: List[Dict], landing_pages: Optional[Dict] = None) -> List[ReportRow]:
+    """Join analytics records with campaign and creative details into report rows"""
+    report_data = list(iter_report_rows(client, campaigns_map, creatives_map, analytics, landing_pages))
     
     # Sort by clicks (descending)
     report_data.sort(key=lambda x: x["clicks"], reverse=True)
@@ -237,39 +1144,110 @@ def generate_report(client: LinkedInAdsClient, days: int = 7):
     return report_data
 
 
-def save_to_csv(data: List[Dict], filename: str = "linkedin_ads_report.csv"):
-    """Save report data to CSV file"""
-    if not data:
-        print("No data to save")
-        return
+def open_text_output(filename: str, compression: Optional[str] = None):
+    """Open a text file for writing, optionally gzip or zstd compressed
+    
+    ``compression`` defaults to the file suffix (``.gz`` or ``.zst``).
+    zstd needs the optional ``zstandard`` package.
+    """
+    if compression is None:
+        compression = {".gz": "gzip", ".zst": "zstd"}.get(os.path.splitext(filename)[1])
+    if compression == "gzip":
+        return gzip.open(filename, 'wt', newline='', encoding='utf-8')
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd output requires zstandard: pip install zstandard")
+        raw = zstandard.ZstdCompressor().stream_writer(open(filename, 'wb'))
+        return io.TextIOWrapper(raw, newline='', encoding='utf-8')
+    if compression:
+        raise ValueError(f"Unsupported compression: {compression}")
+    return open(filename, 'w', newline='', encoding='utf-8', buffering=1024 * 1024)
+
+
+def save_to_csv(data: Iterable[Dict], filename: str = "linkedin_ads_report.csv",
+                fieldnames: Optional[List[str]] = None, compression: Optional[str] = None,
+                chunk_size: int = 10000) -> int:
+    """Save report data to CSV file
+    
+    ``data`` may be any iterable or generator of rows; they are written in
+    chunks of ``chunk_size`` so memory use does not grow with the report.
+    Columns default to the keys of the first row. ``ReportRow`` rows are
+    written straight from their slots. Returns the number of rows written.
+    """
+    rows = iter(data)
+    first = next(rows, None)
+    if first is None:
+        logger.warning("No data to save")
+        return 0
     
-    with open(filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=data[0].keys())
-        writer.writeheader()
-        writer.writerows(data)
+    fieldnames = fieldnames or list(first.keys())
+    count = 0
+    with open_text_output(filename, compression) as f:
+        rows = itertools.chain([first], rows)
+        if isinstance(first, ReportRow) and list(first.columns) == fieldnames:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            values = operator.attrgetter(*fieldnames)
+            rows = (values(row) for row in rows)
+        else:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            writer.writerows(chunk)
+            count += len(chunk)
     
-    print(f"\n✓ Report saved to: {filename}")
+    logger.info("✓ Report saved to: %s", filename)
+    return count
 
 
-def print_summary(data: List[Dict]):
+def save_report(data: Iterable[Dict], filename: str, fieldnames: Optional[List[str]] = None) -> int:
+    """Save report rows in the format given by the file suffix
+    
+    ``.parquet``, ``.arrow`` and ``.feather`` are written as typed columnar
+    files (requires pyarrow); anything else is written as (compressed) CSV.
+    """
+    if os.path.splitext(filename)[1] in (".parquet", ".arrow", ".feather"):
+        import linkedin_ads_columnar
+        schema = linkedin_ads_columnar.report_schema(fieldnames or REPORT_COLUMNS)
+        return linkedin_ads_columnar.save_to_columnar(data, filename, schema)
+    return save_to_csv(data, filename, fieldnames)
+
+
+def print_summary(data: List[Dict], metrics: Optional[List[str]] = None):
     """Print summary statistics"""
     if not data:
         print("No data available")
         return
     
-    total_clicks = sum(item["clicks"] for item in data)
-    total_impressions = sum(item["impressions"] for item in data)
-    total_campaigns = len(set(item["campaign_id"] for item in data))
-    total_creatives = len(set(item["creative_id"] for item in data))
+    print_summary_stats(summarize_report(data, metrics=metrics))
+
+
+def print_summary_stats(stats: Dict):
+    """Print summary statistics computed by summarize_report (or an equivalent engine)"""
+    total_clicks = stats["clicks"]
+    total_impressions = stats["impressions"]
+    approx = "~" if stats.get("approximate") else ""
     
     print("\n" + "="*80)
     print("SUMMARY")
     print("="*80)
-    print(f"Total Campaigns: {total_campaigns}")
-    print(f"Total Creatives: {total_creatives}")
+    print(f"Total Campaigns: {approx}{stats['campaigns']}")
+    print(f"Total Creatives: {approx}{stats['creatives']}")
     print(f"Total Clicks: {total_clicks:,}")
     print(f"Total Impressions: {total_impressions:,}")
     print(f"Average CTR: {(total_clicks/total_impressions*100):.2f}%" if total_impressions > 0 else "N/A")
+    totals = stats.get("totals", {})
+    for metric, total in totals.items():
+        label = metric.replace("_", " ").title()
+        print(f"Total {label}: {total:,.2f}" if isinstance(total, float) else f"Total {label}: {total:,}")
+    if "cost_in_local_currency" in totals:
+        cpc = ratio(totals["cost_in_local_currency"], total_clicks)
+        print(f"Average CPC: {cpc:.2f}" if cpc is not None else "Average CPC: N/A")
     
     print("\n" + "="*80)
     print("TOP 10 PERFORMING ADS (by clicks)")
@@ -277,7 +1255,7 @@ def print_summary(data: List[Dict]):
     print(f"{'Campaign':<30} {'Creative ID':<15} {'Clicks':<10} {'Landing Page'}")
     print("-"*80)
     
-    for item in data[:10]:
+    for item in stats["top"]:
         campaign_name = item["campaign_name"][:28]
         creative_id = str(item["creative_id"])[:13]
         clicks = item["clicks"]
@@ -286,54 +1264,456 @@ def print_summary(data: List[Dict]):
         print(f"{campaign_name:<30} {creative_id:<15} {clicks:<10} {landing_page}")
 
 
-def main():
-    """Main execution function"""
+def connection_failed(client: LinkedInAdsClient):
+    """Log how to fix a rejected access token and exit"""
+    client.log.error("✗ Failed to connect to LinkedIn API\n\nPlease check:\n"
+                     "  1. Your access token is valid (tokens expire after 60 days)\n"
+                     "  2. Go to https://www.linkedin.com/developers/apps\n"
+                     "  3. Select your app → Auth tab → Generate new token\n"
+                     "  4. Ensure the token has r_ads and r_ads_reporting scopes")
+    sys.exit(1)
+
+
+def run_report(client: LinkedInAdsClient, days: int = 7,
+               filename: str = "linkedin_ads_report.csv", engine: str = "python",
+               stream: bool = False):
+    """Run the connection check, report generation and output for one client
+    
+    With ``client.lazy_auth`` the ``/v2/me`` check is skipped and a token
+    rejected by the first real call raises ``AuthenticationError``.
+    
+    With ``engine="arrow"`` the report stays a column table from the join
+    through the summary and the writer. With ``stream`` rows are written
+    (unsorted) as analytics pages arrive and summarized in the same pass.
+    """
     
-    # Check for access token
-    if len(sys.argv) < 3:
-        print("Usage: python linkedin_ads_report.py <ACCESS_TOKEN> <ACCOUNT_ID> [DAYS]")
-        print("\nExample:")
-        print("  python linkedin_ads_report.py 'YOUR_TOKEN' '507539077' 7")
-        print("\nHow to get your access token:")
-        print("  1. Go to https://www.linkedin.com/developers/apps")
-        print("  2. Select your app")
-        print("  3. Go to 'Auth' tab")
-        print("  4. Generate a new access token with r_ads and r_ads_reporting scopes")
-        sys.exit(1)
-    
-    access_token = sys.argv[1]
-    account_id = sys.argv[2]
-    days = int(sys.argv[3]) if len(sys.argv) > 3 else 7
-    
-    # Create client and generate report
-    client = LinkedInAdsClient(access_token, account_id)
-    
-    # Test connection first
-    if not client.test_connection():
-        print("\n✗ Failed to connect to LinkedIn API")
-        print("\nPlease check:")
-        print("  1. Your access token is valid (tokens expire after 60 days)")
-        print("  2. Go to https://www.linkedin.com/developers/apps")
-        print("  3. Select your app → Auth tab → Generate new token")
-        print("  4. Ensure the token has r_ads and r_ads_reporting scopes")
-        sys.exit(1)
-    
-    print()
-    report_data = generate_report(client, days)
+    # Test connection first, unless the first real call validates the token
+    if not client.lazy_auth and not client.test_connection():
+        connection_failed(client)
+    
+    columns = report_columns(client.metrics)
+    stage = client.instrumentation.stage
+    if stream:
+        summary = SummaryAccumulator(metrics=client.metrics)
+        rows = summary.track(generate_report_iter(client, days))
+        # Analytics are fetched, joined and written in one pass
+        with stage("stream"):
+            written = save_report(rows, filename, columns)
+        if written:
+            print_summary_stats(summary.result())
+            client.log.info("✓ Report generation complete!")
+            return
+        report_data = []
+    elif engine == "arrow":
+        import linkedin_ads_vectorized
+        report_data = fetch_report_data(client, days)
+        with stage("join"):
+            report_table = linkedin_ads_vectorized.build_report_table(client, *report_data)
+        if report_table.num_rows:
+            with stage("summary"):
+                print_summary_stats(linkedin_ads_vectorized.summarize_table(report_table))
+            with stage("write"):
+                linkedin_ads_vectorized.save_table(report_table, filename, columns)
+            client.log.info("✓ Report generation complete!")
+            return
+        report_data = []
+    else:
+        report_data = generate_report(client, days)
     
     if report_data:
         # Print summary
-        print_summary(report_data)
+        with stage("summary"):
+            print_summary(report_data, client.metrics)
         
         # Save to CSV
-        save_to_csv(report_data)
+        with stage("write"):
+            save_report(report_data, filename, columns)
         
-        print("\n✓ Report generation complete!")
+        client.log.info("✓ Report generation complete!")
+    else:
+        client.log.error("✗ No data retrieved. Please check:\n"
+                         "  - Access token is valid\n"
+                         "  - Token has r_ads and r_ads_reporting scopes\n"
+                         "  - Account ID is correct")
+
+
+def run_timeseries(client: LinkedInAdsClient, days: int = 7,
+                   filename: str = "linkedin_ads_timeseries.csv", granularity: str = "DAILY"):
+    """Fetch DAILY or MONTHLY analytics, print the trend and save one row per key and period"""
+    client.log.info("→ Fetching %s analytics for the last %d days...", granularity.lower(), days)
+    series = client.get_analytics_series(days, granularity)
+    if not len(series):
+        client.log.warning("  ✗ No time-series data retrieved")
+        return
+    
+    periods = 7 if granularity == "DAILY" else 1
+    label = "week" if granularity == "DAILY" else "month"
+    deltas = [(metric, series.period_delta(metric, periods)) for metric in series.metrics]
+    if any(delta is None for _, delta in deltas):
+        client.log.warning("  Not enough complete %ss for a %s-over-%s trend", label, label, label)
+    else:
+        print("\n" + "="*80)
+        print(f"TREND ({label} over {label})")
+        print("="*80)
+        for metric, (current, previous, change) in deltas:
+            delta = f"{change * 100:+.1f}%" if change is not None else "N/A"
+            spec = ",.2f" if isinstance(current, float) or isinstance(previous, float) else ","
+            print(f"{metric.replace('_', ' ').title():<30} {current:>14{spec}} {previous:>14{spec}} {delta:>10}")
+    save_report(series.iter_rows(), filename, series.columns())
+
+
+def print_timing_summary(stats: Dict):
+    """Print per-endpoint request timings and per-stage seconds from ``HistogramSink.summary``"""
+    print("\n" + "="*80)
+    print("REQUEST TIMINGS")
+    print("="*80)
+    print(f"{'Endpoint':<34} {'Status':<7} {'Count':>6} {'Retries':>8} {'p50 ms':>8} {'p95 ms':>8} {'KB':>8}")
+    print("-"*80)
+    for e in stats["endpoints"]:
+        print(f"{e['endpoint'][:33]:<34} {e['status']:<7} {e['count']:>6} {e['retries']:>8} "
+              f"{e['p50'] * 1000:>8.1f} {e['p95'] * 1000:>8.1f} {e['bytes'] / 1024:>8.1f}")
+    if stats["stages"]:
+        print("\nStages: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in stats["stages"].items()))
+
+
+class JSONLogFormatter(logging.Formatter):
+    """Format log records as one JSON object per line
+    
+    Each line has ``ts``, ``level``, ``logger`` and ``message``, plus the
+    client's ``account_id`` and any exception traceback as ``exc``.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage().strip(),
+        }
+        account_id = getattr(record, "account_id", None)
+        if account_id is not None:
+            entry["account_id"] = account_id
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextLogFormatter(logging.Formatter):
+    """Plain progress messages, prefixed with the account ID when ``show_account`` is set"""
+    
+    def __init__(self, show_account: bool = False):
+        super().__init__("%(message)s")
+        self.show_account = show_account
+    
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        account_id = getattr(record, "account_id", None)
+        if self.show_account and account_id is not None:
+            return f"[{account_id}] {message}"
+        return message
+
+
+def configure_logging(level: str = "INFO", log_format: str = "text", show_account: bool = False):
+    """Send ``linkedin_ads`` log records to stderr, as text or JSON lines
+    
+    Records below ``level`` are dropped before their message is formatted,
+    so progress logging costs next to nothing at WARNING.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(JSONLogFormatter() if log_format == "json" else TextLogFormatter(show_account))
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def parse_chunk(value: str):
+    """Parse a --chunk value: day, week, month or a positive number of days"""
+    if value in CHUNK_SIZES:
+        return value
+    try:
+        days = int(value)
+    except ValueError:
+        days = 0
+    if days < 1:
+        raise argparse.ArgumentTypeError(f"expected one of {', '.join(CHUNK_SIZES)} or a number of days")
+    return days
+
+
+def parse_metrics(value: str) -> List[str]:
+    """Parse a --metrics value: comma-separated metric columns"""
+    try:
+        return resolve_metrics(m.strip() for m in value.split(",") if m.strip())
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def parse_account_ids(value: str) -> List[str]:
+    """Parse a comma-separated list of account IDs, or ``@path`` to a file with one per line"""
+    if value.startswith("@"):
+        with open(value[1:], encoding='utf-8') as f:
+            text = f.read().replace("\n", ",")
     else:
-        print("\n✗ No data retrieved. Please check:")
-        print("  - Access token is valid")
-        print("  - Token has r_ads and r_ads_reporting scopes")
-        print("  - Account ID is correct")
+        text = value
+    return [a.strip() for a in text.split(",") if a.strip() and not a.strip().startswith("#")]
+
+
+def generate_account_report(access_token: str, account_id: str, days: int,
+                            session: requests.Session,
+                            client_options: Optional[Dict] = None, engine: str = "python") -> Dict:
+    """Generate the report for one account and record its outcome
+    
+    A rejected token (``AuthenticationError``, with ``lazy_auth``) fails
+    every account alike, so it is raised instead of recorded.
+    """
+    started = time.monotonic()
+    result = {"account_id": account_id, "success": False, "rows": [], "error": None}
+    try:
+        with LinkedInAdsClient(access_token, account_id, session=session,
+                               **(client_options or {})) as client:
+            result["rows"] = generate_report(client, days, engine)
+        result["success"] = bool(result["rows"])
+        if not result["success"]:
+            result["error"] = "No data retrieved"
+    except AuthenticationError:
+        raise
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["elapsed"] = time.monotonic() - started
+    return result
+
+
+def run_batch(access_token: str, account_ids: List[str], days: int = 7,
+              workers: int = 8, output_dir: str = ".",
+              client_options: Optional[Dict] = None, extension: str = ".csv",
+              engine: str = "python") -> List[Dict]:
+    """Generate reports for many accounts on a bounded worker pool
+    
+    All workers share one pooled session, one application-wide rate limiter
+    and one set of endpoint preferences, so the working endpoint variant is
+    only discovered once. ``client_options`` are passed to every
+    ``LinkedInAdsClient``. Each account gets its own report file and the
+    rows of every account are also written to a combined file with an
+    ``account_id`` column; ``extension`` (e.g. ``.csv.gz``, ``.parquet``)
+    selects the output format. Returns the per-account results in input order.
+    
+    The token is checked once before any account is fetched, honouring
+    ``lazy_auth`` and ``auth_cache``; a rejected token exits via
+    ``connection_failed``.
+    """
+    client_options = dict(client_options or {})
+    client_options.setdefault("endpoint_preferences", EndpointPreferences())
+    client_options.setdefault("rate_limiter", RateLimiter())
+    session = create_session(pool_size=workers)
+    try:
+        results = []
+        with LinkedInAdsClient(access_token, account_ids[0], session=session, **client_options) as client:
+            if not client.lazy_auth and not client.test_connection():
+                connection_failed(client)
+            if client.lazy_auth:
+                # Not probed (or trusted from the auth cache): the first account's
+                # calls validate the token before the others start
+                try:
+                    results.append(generate_account_report(access_token, account_ids[0], days, session,
+                                                           {**client_options, "lazy_auth": True}, engine))
+                except AuthenticationError as e:
+                    client.log.error("✗ Access token rejected: %s", e)
+                    connection_failed(client)
+        # The token works, so a 401/403 from here on concerns a single account
+        client_options["lazy_auth"] = False
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results.extend(executor.map(
+                lambda account_id: generate_account_report(access_token, account_id, days,
+                                                           session, client_options, engine),
+                account_ids[len(results):]
+            ))
+    finally:
+        session.close()
+    
+    metrics = resolve_metrics(client_options.get("metrics"))
+    columns = report_columns(metrics)
+    combined_row = report_row_type(tuple(["account_id"] + columns))
+    combined = []
+    for result in results:
+        if result["success"]:
+            filename = f"linkedin_ads_report_{result['account_id']}{extension}"
+            save_report(result["rows"], os.path.join(output_dir, filename), columns)
+            combined.extend(combined_row(result["account_id"], *(row[c] for c in columns))
+                            for row in result["rows"])
+    
+    combined.sort(key=lambda x: x["clicks"], reverse=True)
+    if combined:
+        print_summary(combined, metrics)
+        save_report(combined, os.path.join(output_dir, f"linkedin_ads_report_combined{extension}"),
+                    ["account_id"] + columns)
+    print_batch_summary(results, client_options["rate_limiter"])
+    return results
+
+
+def print_batch_summary(results: List[Dict], rate_limiter: Optional[RateLimiter] = None):
+    """Print the success/failure status of every account in a batch run"""
+    succeeded = sum(1 for r in results if r["success"])
+    
+    print("\n" + "="*80)
+    print(f"BATCH SUMMARY: {succeeded}/{len(results)} accounts succeeded")
+    print("="*80)
+    print(f"{'Account':<15} {'Status':<8} {'Rows':<8} {'Time':<8} {'Error'}")
+    print("-"*80)
+    
+    for result in results:
+        status = "✓ OK" if result["success"] else "✗ FAIL"
+        error = (result["error"] or "")[:40]
+        print(f"{result['account_id']:<15} {status:<8} {len(result['rows']):<8} {result['elapsed']:<8.1f} {error}")
+    
+    if rate_limiter:
+        stats = rate_limiter.stats()
+        print("-"*80)
+        print(f"Requests: {stats['requests']:,}  Retries: {stats['retries']:,}  "
+              f"Throttled: {stats['throttled_responses']:,} ({stats['throttled_seconds']:.1f}s waiting)")
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(
+        description="Fetch LinkedIn Ads campaigns, creatives, landing pages and clicks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""Example:
+  python linkedin_ads_report.py 'YOUR_TOKEN' '507539077' 7
+  python linkedin_ads_report.py 'YOUR_TOKEN' '507539077,507539078' 7 --workers 16
+  python linkedin_ads_report.py 'YOUR_TOKEN' @accounts.txt 7
+
+How to get your access token:
+  1. Go to https://www.linkedin.com/developers/apps
+  2. Select your app
+  3. Go to 'Auth' tab
+  4. Generate a new access token with r_ads and r_ads_reporting scopes"""
+    )
+    parser.add_argument("access_token", metavar="ACCESS_TOKEN")
+    parser.add_argument("account_ids", metavar="ACCOUNT_ID",
+                        help="account ID, comma-separated IDs, or @file with one ID per line")
+    parser.add_argument("days", metavar="DAYS", type=int, nargs="?", default=7)
+    parser.add_argument("--workers", type=int, default=8,
+                        help="concurrent accounts in batch mode (default: 8)")
+    parser.add_argument("--output", default="linkedin_ads_report.csv",
+                        help="report file; .gz/.zst compress the CSV, .parquet/.arrow write "
+                             "columnar files (default: linkedin_ads_report.csv)")
+    parser.add_argument("--output-dir", default=".",
+                        help="directory for batch mode CSV files (default: .)")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow"], default="csv",
+                        help="batch mode file format (default: csv)")
+    parser.add_argument("--compression", choices=["gzip", "zstd"],
+                        help="compress batch mode CSV files")
+    parser.add_argument("--endpoint-cache", metavar="PATH",
+                        help="remember working endpoint variants across runs in this JSON file")
+    parser.add_argument("--chunk", type=parse_chunk,
+                        help="split the analytics range into day, week, month or N-day windows")
+    parser.add_argument("--chunk-workers", type=int, default=4,
+                        help="concurrent analytics windows per account (default: 4)")
+    parser.add_argument("--state-db", metavar="PATH",
+                        help="incremental mode: keep daily analytics in this SQLite file "
+                             "and only fetch new days")
+    parser.add_argument("--restatement-days", type=int, default=2,
+                        help="days before the last sync to re-fetch in incremental mode (default: 2)")
+    parser.add_argument("--cache", metavar="PATH",
+                        help="cache campaign and creative responses in this SQLite file")
+    parser.add_argument("--cache-ttl", type=float, default=3600,
+                        help="seconds before cached metadata is revalidated (default: 3600)")
+    parser.add_argument("--cache-max-mb", type=float, default=256,
+                        help="size limit of the response cache in MB (default: 256)")
+    parser.add_argument("--engine", choices=["python", "arrow"], default="python",
+                        help="report join/summary engine; arrow is vectorized and needs pyarrow")
+    parser.add_argument("--stream", action="store_true",
+                        help="write rows as analytics pages arrive (unsorted) in constant memory")
+    parser.add_argument("--timeseries", metavar="PATH",
+                        help="also save per-period analytics (one row per campaign, creative "
+                             "and period) to this file")
+    parser.add_argument("--granularity", choices=["daily", "monthly"], default="daily",
+                        help="period of --timeseries rows (default: daily)")
+    parser.add_argument("--referenced-only", action="store_true",
+                        help="fetch analytics first and batch-get only the campaigns and "
+                             "creatives they reference")
+    parser.add_argument("--base-url", default="https://api.linkedin.com",
+                        help="API base URL, e.g. a local linkedin_ads_mock server")
+    parser.add_argument("--trace-log", metavar="PATH",
+                        help="append one JSON line per HTTP request and report stage to this file")
+    parser.add_argument("--prom-file", metavar="PATH",
+                        help="write request/stage metrics in Prometheus text format to this file")
+    parser.add_argument("--timings", action="store_true",
+                        help="print request latency percentiles and stage timings at the end")
+    parser.add_argument("--lazy-auth", action="store_true",
+                        help="skip the /v2/me connection test; a 401/403 on the first real "
+                             "call fails the run instead")
+    parser.add_argument("--auth-cache", metavar="PATH",
+                        help="skip the connection test for a token that passed it within "
+                             "--auth-cache-ttl (tokens are stored hashed in this JSON file)")
+    parser.add_argument("--auth-cache-ttl", type=float, default=3600,
+                        help="seconds a successful token check is trusted (default: 3600)")
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], default="INFO",
+                        help="progress log level; DEBUG shows every endpoint attempt (default: INFO)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only log warnings and errors (same as --log-level WARNING)")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text",
+                        help="stderr log format; json writes one object per line (default: text)")
+    parser.add_argument("--metrics", type=parse_metrics,
+                        help="comma-separated report metrics: clicks, impressions, landing_page_clicks, "
+                             "cost_in_local_currency, conversions, video_views, ctr, cpc "
+                             "(default: clicks,impressions,landing_page_clicks)")
+    args = parser.parse_args()
+    try:
+        account_ids = parse_account_ids(args.account_ids)
+    except OSError as e:
+        parser.error(f"cannot read account IDs: {e}")
+    if not account_ids:
+        parser.error("no account IDs given")
+    configure_logging("WARNING" if args.quiet else args.log_level, args.log_format,
+                      show_account=len(account_ids) > 1)
+    
+    sinks = []
+    if args.trace_log:
+        sinks.append(JSONLinesSink(args.trace_log))
+    if args.prom_file:
+        sinks.append(PrometheusTextfileSink(args.prom_file))
+    elif args.timings:
+        sinks.append(HistogramSink())
+    instrumentation = Instrumentation(sinks)
+    
+    client_options = {
+        "instrumentation": instrumentation,
+        "endpoint_preferences": EndpointPreferences(args.endpoint_cache),
+        "analytics_chunk": args.chunk,
+        "chunk_workers": args.chunk_workers,
+        "state_store": AnalyticsStore(args.state_db) if args.state_db else None,
+        "restatement_days": args.restatement_days,
+        "response_cache": SQLiteResponseCache(args.cache, int(args.cache_max_mb * 1024 * 1024)) if args.cache else None,
+        "cache_ttls": {"campaigns": args.cache_ttl, "creatives": args.cache_ttl},
+        "metrics": args.metrics,
+        "referenced_only": args.referenced_only,
+        "base_url": args.base_url,
+        "lazy_auth": args.lazy_auth,
+        "auth_cache": TokenCheckCache(args.auth_cache, args.auth_cache_ttl) if args.auth_cache else None
+    }
+    try:
+        if len(account_ids) > 1:
+            extension = "." + args.format
+            if args.format == "csv":
+                extension += {"gzip": ".gz", "zstd": ".zst"}.get(args.compression, "")
+            run_batch(args.access_token, account_ids, args.days, args.workers, args.output_dir,
+                      client_options, extension, args.engine)
+            return
+        
+        # Create client and generate report
+        with LinkedInAdsClient(args.access_token, account_ids[0], **client_options) as client:
+            try:
+                run_report(client, args.days, args.output, args.engine, args.stream)
+                if args.timeseries:
+                    run_timeseries(client, args.days, args.timeseries, args.granularity.upper())
+            except AuthenticationError as e:
+                client.log.error("✗ Access token rejected: %s", e)
+                connection_failed(client)
+    finally:
+        histogram = instrumentation.histogram()
+        if args.timings and histogram is not None:
+            print_timing_summary(histogram.summary())
+        instrumentation.close()
 
 
 if __name__ == "__main__":
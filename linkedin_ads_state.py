@@ -0,0 +1,156 @@
+"""
+Local SQLite state store for incremental LinkedIn Ads analytics syncs
+Keeps daily analytics records and the synced day range per account and pivot
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    account_id TEXT NOT NULL,
+    pivot TEXT NOT NULL,
+    last_synced TEXT NOT NULL,
+    first_synced TEXT,
+    PRIMARY KEY (account_id, pivot)
+);
+CREATE TABLE IF NOT EXISTS daily_analytics (
+    account_id TEXT NOT NULL,
+    pivot TEXT NOT NULL,
+    day TEXT NOT NULL,
+    pivot_values TEXT NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (account_id, pivot, day, pivot_values)
+);
+"""
+
+
+def record_day(record: Dict) -> Optional[date]:
+    """Return the start day of a daily analytics record's dateRange"""
+    start = record.get("dateRange", {}).get("start")
+    if not start:
+        return None
+    return date(start["year"], start["month"], start["day"])
+
+
+class AnalyticsStore:
+    """SQLite store of daily analytics records
+
+    Records are kept per (account, pivot, day, pivot values) as JSON, so a
+    report for any window can be rebuilt without re-querying the API. Safe
+    to share between threads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self._lock = threading.Lock()
+
+    def _migrate(self):
+        """Add first_synced to stores created before it was tracked
+
+        The earliest stored day is the best estimate of where coverage starts.
+        """
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(sync_state)")]
+        if "first_synced" in columns:
+            return
+        with self._conn:
+            self._conn.execute("ALTER TABLE sync_state ADD COLUMN first_synced TEXT")
+            self._conn.execute(
+                "UPDATE sync_state SET first_synced = COALESCE(("
+                "SELECT MIN(day) FROM daily_analytics d "
+                "WHERE d.account_id = sync_state.account_id AND d.pivot = sync_state.pivot"
+                "), last_synced)"
+            )
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+    def last_synced(self, account_id: str, pivot: str) -> Optional[date]:
+        """Return the last day synced for an account and pivot, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_synced FROM sync_state WHERE account_id = ? AND pivot = ?",
+                (account_id, pivot)
+            ).fetchone()
+        return date.fromisoformat(row[0]) if row else None
+
+    def synced_range(self, account_id: str, pivot: str) -> Optional[Tuple[date, date]]:
+        """Return the first and last day synced for an account and pivot, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT first_synced, last_synced FROM sync_state WHERE account_id = ? AND pivot = ?",
+                (account_id, pivot)
+            ).fetchone()
+        return (date.fromisoformat(row[0]), date.fromisoformat(row[1])) if row else None
+
+    def save_days(self, account_id: str, pivot: str, start_date: date, end_date: date,
+                  records: List[Dict]):
+        """Replace the stored records for an inclusive day range and mark it synced
+
+        Records without a dateRange inside the range are ignored. Days in the
+        range that are missing from ``records`` end up empty, which is what
+        the API reports for days without activity. A range overlapping or
+        next to the synced range extends it; a disjoint one replaces it, since
+        the days in between were never fetched.
+        """
+        rows = []
+        for record in records:
+            day = record_day(record)
+            if day is None or not start_date <= day <= end_date:
+                continue
+            rows.append((account_id, pivot, day.isoformat(),
+                         json.dumps(record.get("pivotValues", [])), json.dumps(record)))
+
+        with self._lock, self._conn:
+            synced = self._conn.execute(
+                "SELECT first_synced, last_synced FROM sync_state WHERE account_id = ? AND pivot = ?",
+                (account_id, pivot)
+            ).fetchone()
+            first_synced, last_synced = start_date, end_date
+            if synced is not None:
+                first, last = date.fromisoformat(synced[0]), date.fromisoformat(synced[1])
+                if start_date <= last + timedelta(days=1) and end_date >= first - timedelta(days=1):
+                    first_synced, last_synced = min(first, start_date), max(last, end_date)
+            self._conn.execute(
+                "DELETE FROM daily_analytics WHERE account_id = ? AND pivot = ? AND day BETWEEN ? AND ?",
+                (account_id, pivot, start_date.isoformat(), end_date.isoformat())
+            )
+            self._conn.executemany("INSERT OR REPLACE INTO daily_analytics VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (account_id, pivot, last_synced, first_synced) "
+                "VALUES (?, ?, ?, ?)",
+                (account_id, pivot, last_synced.isoformat(), first_synced.isoformat())
+            )
+
+    def load(self, account_id: str, pivot: str, start_date: date, end_date: date) -> List[Dict]:
+        """Return the stored daily records for an inclusive day range"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record FROM daily_analytics "
+                "WHERE account_id = ? AND pivot = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (account_id, pivot, start_date.isoformat(), end_date.isoformat())
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def prune(self, account_id: str, pivot: str, before: date) -> int:
+        """Delete records older than ``before`` and return how many were removed"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM daily_analytics WHERE account_id = ? AND pivot = ? AND day < ?",
+                (account_id, pivot, before.isoformat())
+            )
+            # Pruned days are no longer covered and would be fetched again
+            self._conn.execute(
+                "UPDATE sync_state SET first_synced = ? "
+                "WHERE account_id = ? AND pivot = ? AND first_synced < ?",
+                (before.isoformat(), account_id, pivot, before.isoformat())
+            )
+        return cursor.rowcount
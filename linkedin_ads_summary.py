@@ -0,0 +1,131 @@
+"""
+Single-pass summary of LinkedIn Ads report rows
+Totals, top rows by clicks and distinct counts that fall back to HyperLogLog on huge reports
+"""
+
+import hashlib
+import heapq
+import math
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from linkedin_ads_metrics import DEFAULT_METRICS, METRICS
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch (about 0.8% standard error at precision 14)"""
+    
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+        self._value_bits = 64 - precision
+    
+    def add(self, value):
+        digest = hashlib.blake2b(repr(value).encode("utf-8"), digest_size=8).digest()
+        x = int.from_bytes(digest, "big")
+        index = x >> self._value_bits
+        rank = self._value_bits - (x & ((1 << self._value_bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+    
+    def count(self) -> int:
+        m = self.size
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class DistinctCounter:
+    """Exact distinct count that switches to HyperLogLog past ``exact_limit`` values"""
+    
+    def __init__(self, exact_limit: int = 100000):
+        self.exact_limit = exact_limit
+        self.values = set()
+        self.sketch = None
+    
+    @property
+    def approximate(self) -> bool:
+        return self.sketch is not None
+    
+    def add(self, value):
+        if self.sketch is not None:
+            self.sketch.add(value)
+            return
+        self.values.add(value)
+        if len(self.values) > self.exact_limit:
+            self.sketch = HyperLogLog()
+            for v in self.values:
+                self.sketch.add(v)
+            self.values = set()
+    
+    def count(self) -> int:
+        return self.sketch.count() if self.sketch is not None else len(self.values)
+
+
+class SummaryAccumulator:
+    """Single-pass report summary: totals, distinct counts and top rows by clicks
+    
+    Rows can arrive in any order and from a stream. The top ``top_n`` rows
+    are kept in a bounded heap (O(n log k)); distinct campaign/creative
+    counts are exact up to ``exact_limit`` values and estimated with
+    HyperLogLog beyond that.
+    """
+    
+    def __init__(self, top_n: int = 10, exact_limit: int = 100000,
+                 metrics: Optional[List[str]] = None):
+        self.top_n = top_n
+        self.campaigns = DistinctCounter(exact_limit)
+        self.creatives = DistinctCounter(exact_limit)
+        self.clicks = 0
+        self.impressions = 0
+        # Totals of the optional base metrics selected (derived ones are recomputed)
+        self.totals = {m: 0 for m in (metrics or DEFAULT_METRICS)
+                       if m in METRICS and m not in DEFAULT_METRICS}
+        self.rows = 0
+        self._top = []  # min-heap of (clicks, -row number, row)
+    
+    def add(self, row: Dict):
+        self.campaigns.add(row["campaign_id"])
+        self.creatives.add(row["creative_id"])
+        self.clicks += row["clicks"]
+        self.impressions += row["impressions"]
+        for metric in self.totals:
+            self.totals[metric] += row.get(metric) or 0
+        # Earlier rows win ties, as with a stable sort
+        entry = (row["clicks"], -self.rows, row)
+        self.rows += 1
+        if len(self._top) < self.top_n:
+            heapq.heappush(self._top, entry)
+        elif entry[:2] > self._top[0][:2]:
+            heapq.heapreplace(self._top, entry)
+    
+    def update(self, rows: Iterable[Dict]) -> "SummaryAccumulator":
+        for row in rows:
+            self.add(row)
+        return self
+    
+    def track(self, rows: Iterable[Dict]) -> Iterator[Dict]:
+        """Pass rows through to another consumer (e.g. a writer) while accumulating them"""
+        for row in rows:
+            self.add(row)
+            yield row
+    
+    def result(self) -> Dict:
+        """Return the summary in the shape expected by print_summary_stats"""
+        return {
+            "campaigns": self.campaigns.count(),
+            "creatives": self.creatives.count(),
+            "clicks": self.clicks,
+            "impressions": self.impressions,
+            "totals": dict(self.totals),
+            "top": [entry[2] for entry in sorted(self._top, key=lambda e: e[:2], reverse=True)],
+            "approximate": self.campaigns.approximate or self.creatives.approximate
+        }
+
+
+def summarize_report(data: Iterable[Dict], top_n: int = 10,
+                     metrics: Optional[List[str]] = None) -> Dict:
+    """Compute summary statistics of report rows in a single pass (any order)"""
+    return SummaryAccumulator(top_n, metrics=metrics).update(data).result()
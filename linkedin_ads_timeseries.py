@@ -0,0 +1,191 @@
+"""
+Compact time series of LinkedIn Ads analytics
+Keeps DAILY or MONTHLY metrics per (campaign, creative) in typed arrays indexed by period offset
+"""
+
+from array import array
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from linkedin_ads_metrics import DEFAULT_METRICS, METRICS, metric_number, ratio
+from linkedin_ads_state import record_day
+from linkedin_ads_urn import urn_id
+
+
+GRANULARITIES = ("DAILY", "MONTHLY")
+
+
+def month_offset(start: date, day: date) -> int:
+    """Number of calendar months from ``start``'s month to ``day``'s month"""
+    return (day.year - start.year) * 12 + day.month - start.month
+
+
+class AnalyticsTimeSeries:
+    """Analytics metrics per (campaign URN, creative URN) and period
+
+    Each key holds one ``array`` per metric (``q`` for counts, ``d`` for
+    cost), with index ``i`` being the i-th day (DAILY) or calendar month
+    (MONTHLY) from ``start_date``. Records of any finer granularity can be
+    added: a record is binned by the start of its ``dateRange``, so daily
+    records from the state store build a monthly series too.
+    """
+
+    def __init__(self, start_date: date, end_date: date, granularity: str = "DAILY",
+                 metrics: Optional[List[str]] = None):
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity {granularity!r}; use DAILY or MONTHLY")
+        self.start_date = start_date
+        self.end_date = end_date
+        self.granularity = granularity
+        self.metrics = [m for m in (metrics or DEFAULT_METRICS) if m in METRICS]
+        self.periods = self.offset(end_date) + 1
+        self.series = {}  # type: Dict[Tuple[str, str], Dict[str, array]]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], start_date: date, end_date: date,
+                     granularity: str = "DAILY", metrics: Optional[List[str]] = None) -> "AnalyticsTimeSeries":
+        """Build a series from analytics records carrying a ``dateRange``"""
+        return cls(start_date, end_date, granularity, metrics).update(records)
+
+    def offset(self, day: date) -> int:
+        """Index of the period containing ``day``"""
+        if self.granularity == "MONTHLY":
+            return month_offset(self.start_date, day)
+        return (day - self.start_date).days
+
+    def dates(self) -> List[date]:
+        """Start date of every period, in index order
+
+        A MONTHLY series starting mid-month labels its first period with
+        ``start_date``, where its data actually starts.
+        """
+        if self.granularity == "MONTHLY":
+            first = self.start_date.replace(day=1)
+            months = [date(first.year + (first.month - 1 + i) // 12, (first.month - 1 + i) % 12 + 1, 1)
+                      for i in range(self.periods)]
+            return [self.start_date] + months[1:]
+        return [self.start_date + timedelta(days=i) for i in range(self.periods)]
+
+    def _arrays(self, key: Tuple[str, str]) -> Dict[str, array]:
+        arrays = self.series.get(key)
+        if arrays is None:
+            arrays = self.series[key] = {
+                m: array("d" if METRICS[m][1] is float else "q", bytes(8 * self.periods))
+                for m in self.metrics
+            }
+        return arrays
+
+    def add(self, record: Dict) -> bool:
+        """Add one record's metrics to its key and period; False if it falls outside the series"""
+        pivot_values = record.get("pivotValues", [])
+        day = record_day(record)
+        if len(pivot_values) < 2 or day is None:
+            return False
+        index = self.offset(day)
+        if not 0 <= index < self.periods:
+            return False
+        arrays = self._arrays((pivot_values[0], pivot_values[1]))
+        for metric in self.metrics:
+            api_field, cast = METRICS[metric]
+            value = metric_number(record.get(api_field, 0))
+            arrays[metric][index] += cast(value) if cast else int(value)
+        return True
+
+    def update(self, records: Iterable[Dict]) -> "AnalyticsTimeSeries":
+        for record in records:
+            self.add(record)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def values(self, metric: str, key: Optional[Tuple[str, str]] = None) -> List:
+        """Per-period values of a metric for one key, or summed over all keys"""
+        if key is not None:
+            arrays = self.series.get(key)
+            return list(arrays[metric]) if arrays else [0] * self.periods
+        totals = [0] * self.periods
+        for arrays in self.series.values():
+            for i, value in enumerate(arrays[metric]):
+                totals[i] += value
+        return totals
+
+    def total(self, metric: str, key: Optional[Tuple[str, str]] = None) -> float:
+        """Total of a metric over the whole series"""
+        if key is not None:
+            arrays = self.series.get(key)
+            return sum(arrays[metric]) if arrays else 0
+        return sum(sum(arrays[metric]) for arrays in self.series.values())
+
+    def rolling_sum(self, metric: str, window: int = 7, key: Optional[Tuple[str, str]] = None) -> List:
+        """Sum of the trailing ``window`` periods at every period (shorter at the start)"""
+        values = self.values(metric, key)
+        sums = []
+        running = 0
+        for i, value in enumerate(values):
+            running += value
+            if i >= window:
+                running -= values[i - window]
+            sums.append(running)
+        return sums
+
+    def complete_periods(self) -> Tuple[int, int]:
+        """Index range (start, stop) of the periods with a full day or month of data
+
+        Today is still accumulating, so a series ending today drops its last
+        period; a MONTHLY series also drops a first month it only covers in
+        part, and a last month that has not ended.
+        """
+        start, stop = 0, self.periods
+        if self.granularity == "MONTHLY":
+            if self.start_date.day != 1:
+                start = 1
+            if self.end_date >= date.today() or (self.end_date + timedelta(days=1)).day != 1:
+                stop -= 1
+        elif self.end_date >= date.today():
+            stop -= 1
+        return start, max(start, stop)
+
+    def period_delta(self, metric: str, periods: int = 7,
+                     key: Optional[Tuple[str, str]] = None) -> Optional[Tuple[float, float, Optional[float]]]:
+        """Compare the last ``periods`` complete periods with the ``periods`` before them
+
+        Returns (current, previous, relative change), the change being None
+        when the previous total is zero, or None when the series has fewer
+        than ``2 * periods`` complete periods (see ``complete_periods``).
+        """
+        start, stop = self.complete_periods()
+        if periods < 1 or stop - start < 2 * periods:
+            return None
+        values = self.values(metric, key)
+        current = sum(values[stop - periods:stop])
+        previous = sum(values[stop - 2 * periods:stop - periods])
+        return current, previous, ratio(current - previous, previous)
+
+    def week_over_week(self, metric: str = "clicks",
+                       key: Optional[Tuple[str, str]] = None) -> Optional[Tuple[float, float, Optional[float]]]:
+        """Last 7 complete days against the 7 days before (DAILY series only)"""
+        if self.granularity != "DAILY":
+            raise ValueError("Week-over-week deltas need a DAILY series")
+        return self.period_delta(metric, 7, key)
+
+    def iter_rows(self) -> Iterator[Dict]:
+        """Yield long-format rows (one per key and non-empty period) for the report writers"""
+        dates = self.dates()
+        for (campaign_urn, creative_urn), arrays in self.series.items():
+            columns = [arrays[m] for m in self.metrics]
+            for i, day in enumerate(dates):
+                values = [column[i] for column in columns]
+                if not any(values):
+                    continue
+                row = {
+                    "campaign_id": urn_id(campaign_urn),
+                    "creative_id": urn_id(creative_urn),
+                    "date": day.isoformat(),
+                }
+                row.update(zip(self.metrics, values))
+                yield row
+
+    def columns(self) -> List[str]:
+        """Columns of the rows yielded by ``iter_rows``"""
+        return ["campaign_id", "creative_id", "date"] + self.metrics
@@ -0,0 +1,45 @@
+"""
+URN parsing for LinkedIn Ads entities
+Parses ``urn:li:<type>:<id>`` once per distinct URN and keeps compact, interned results
+"""
+
+import sys
+from functools import lru_cache
+from typing import NamedTuple, Optional, Union
+
+
+EntityId = Union[int, str]
+
+
+class Urn(NamedTuple):
+    """A parsed URN: the interned URN string, its entity type and its id
+
+    Numeric ids are ints; anything else stays an (interned) string.
+    """
+    urn: str
+    entity_type: Optional[str]
+    id: EntityId
+
+
+@lru_cache(maxsize=1 << 20)
+def parse_urn(urn: str) -> Urn:
+    """Parse a URN such as ``urn:li:sponsoredCreative:123`` (cached per distinct URN)
+
+    A bare id (``"123"``) parses with no entity type.
+    """
+    urn = sys.intern(urn)
+    head, _, raw_id = urn.rpartition(":")
+    entity_type = sys.intern(head.rpartition(":")[2]) if head else None
+    return Urn(urn, entity_type, int(raw_id) if raw_id.isdigit() else sys.intern(raw_id))
+
+
+def urn_id(urn: Optional[str]) -> Optional[EntityId]:
+    """Id part of a URN, or None for an empty URN"""
+    return parse_urn(urn).id if urn else None
+
+
+def entity_id(value) -> Optional[EntityId]:
+    """Id of an entity's ``id`` field, whether the API gave a URN, a numeric string or an int"""
+    if value is None or isinstance(value, int):
+        return value
+    return urn_id(str(value))
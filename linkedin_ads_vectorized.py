@@ -0,0 +1,141 @@
+"""
+Vectorized report engine for LinkedIn Ads data
+Joins analytics with campaigns and creatives as Arrow column tables
+Requires the optional pyarrow package
+"""
+
+import os
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - optional dependency
+    raise ImportError("The arrow report engine requires pyarrow: pip install pyarrow")
+
+from linkedin_ads_metrics import DEFAULT_METRICS, DERIVED_METRICS, METRICS, metric_number, report_columns
+from linkedin_ads_report import BaseLinkedInAdsClient, save_report
+
+
+def analytics_table(analytics: List[Dict], metrics: Optional[List[str]] = None) -> pa.Table:
+    """Load analytics records with at least two pivot values into a column table
+    
+    ``_row`` keeps the original record order so ties sort like the Python engine.
+    Only the base (non-derived) ``metrics`` are loaded.
+    """
+    records = [item for item in analytics if len(item.get("pivotValues", [])) >= 2]
+    columns = {
+        "_row": pa.array(range(len(records)), pa.int64()),
+        "campaign_urn": pa.array([item["pivotValues"][0] for item in records], pa.string()),
+        "creative_urn": pa.array([item["pivotValues"][1] for item in records], pa.string()),
+    }
+    for metric in metrics or DEFAULT_METRICS:
+        if metric not in METRICS:
+            continue
+        api_field, cast = METRICS[metric]
+        if cast:
+            columns[metric] = pa.array([cast(metric_number(item.get(api_field, 0))) for item in records],
+                                       pa.float64())
+        else:
+            columns[metric] = pa.array([item.get(api_field, 0) for item in records], pa.int64())
+    return pa.table(columns)
+
+
+def derived_metric(numerator: pa.ChunkedArray, denominator: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Vectorized ``numerator / denominator``, with null where the denominator is zero"""
+    denominator = pc.cast(denominator, pa.float64())
+    safe = pc.if_else(pc.equal(denominator, 0), pa.scalar(None, pa.float64()), denominator)
+    return pc.divide(pc.cast(numerator, pa.float64()), safe)
+
+
+def entity_key(key) -> str:
+    """Join key of a campaign/creative map entry (map keys are ids, not always strings)"""
+    return None if key is None else str(key)
+
+
+def urn_id(urns: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Vectorized ``urn.split(":")[-1]``, with null for empty URNs"""
+    ids = pc.replace_substring_regex(urns, pattern="^.*:", replacement="")
+    return pc.if_else(pc.equal(urns, ""), pa.scalar(None, pa.string()), ids)
+
+
+def compact_ids(ids: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Cast an id column to int64 when every id is numeric, like ``linkedin_ads_urn.parse_urn``"""
+    if ids.null_count < len(ids) and pc.all(pc.utf8_is_digit(ids)).as_py():
+        return pc.cast(ids, pa.int64())
+    return ids
+
+
+def build_report_table(client: BaseLinkedInAdsClient, campaigns_map: Dict, creatives_map: Dict,
+                       analytics: List[Dict], landing_pages: Optional[Dict] = None) -> pa.Table:
+    """Join analytics with campaign and creative details as a column table sorted by clicks"""
+    if landing_pages is None:
+        landing_pages = client.landing_page_index(creatives_map)
+    campaigns = pa.table({
+        "campaign_id": pa.array([entity_key(k) for k in campaigns_map], pa.string()),
+        "campaign_name": pa.array([c.get("name", "Unknown") for c in campaigns_map.values()], pa.string()),
+        "campaign_status": pa.array([c.get("status", "Unknown") for c in campaigns_map.values()], pa.string()),
+    })
+    # Landing pages come from the per-creative index rather than once per row
+    creatives = pa.table({
+        "creative_id": pa.array([entity_key(k) for k in creatives_map], pa.string()),
+        "creative_name": pa.array([c.get("name", "Unknown") for c in creatives_map.values()], pa.string()),
+        "landing_page": pa.array([landing_pages.get(k) for k in creatives_map], pa.string()),
+    })
+    
+    table = analytics_table(analytics, client.metrics)
+    table = table.append_column("campaign_id", urn_id(table["campaign_urn"]))
+    table = table.append_column("creative_id", urn_id(table["creative_urn"]))
+    table = table.join(campaigns, "campaign_id", join_type="left outer")
+    table = table.join(creatives, "creative_id", join_type="left outer")
+    table = table.sort_by([("clicks", "descending"), ("_row", "ascending")])
+    
+    columns = {
+        "campaign_id": compact_ids(table["campaign_id"]),
+        "campaign_name": pc.fill_null(table["campaign_name"], "Unknown"),
+        "campaign_status": pc.fill_null(table["campaign_status"], "Unknown"),
+        "creative_id": compact_ids(table["creative_id"]),
+        "creative_name": pc.fill_null(table["creative_name"], "Unknown"),
+        "landing_page": pc.fill_null(table["landing_page"], "N/A"),
+    }
+    for metric in client.metrics:
+        if metric in DERIVED_METRICS:
+            numerator, denominator = DERIVED_METRICS[metric]
+            columns[metric] = derived_metric(table[numerator], table[denominator])
+        else:
+            columns[metric] = table[metric]
+    return pa.table(columns).select(report_columns(client.metrics))
+
+
+def iter_rows(table: pa.Table) -> Iterator[Dict]:
+    """Yield report rows as dicts, one record batch at a time"""
+    for batch in table.to_batches():
+        yield from batch.to_pylist()
+
+
+def build_report(client: BaseLinkedInAdsClient, campaigns_map: Dict, creatives_map: Dict,
+                 analytics: List[Dict], landing_pages: Optional[Dict] = None) -> List[Dict]:
+    """Vectorized equivalent of ``linkedin_ads_report.build_report``"""
+    return build_report_table(client, campaigns_map, creatives_map, analytics, landing_pages).to_pylist()
+
+
+def summarize_table(table: pa.Table, top_n: int = 10) -> Dict:
+    """Vectorized equivalent of ``linkedin_ads_report.summarize_report``"""
+    return {
+        "campaigns": pc.count_distinct(table["campaign_id"], mode="all").as_py(),
+        "creatives": pc.count_distinct(table["creative_id"], mode="all").as_py(),
+        "clicks": pc.sum(table["clicks"]).as_py() or 0,
+        "impressions": pc.sum(table["impressions"]).as_py() or 0,
+        "totals": {name: pc.sum(table[name]).as_py() or 0 for name in table.column_names
+                   if name in METRICS and name not in DEFAULT_METRICS},
+        "top": table.slice(0, top_n).to_pylist()
+    }
+
+
+def save_table(table: pa.Table, filename: str, columns: Optional[List[str]] = None) -> int:
+    """Save a report table, writing columnar formats directly from the columns"""
+    columns = columns or table.column_names
+    if os.path.splitext(filename)[1] in (".parquet", ".arrow", ".feather"):
+        import linkedin_ads_columnar
+        return linkedin_ads_columnar.save_table(table, filename, linkedin_ads_columnar.report_schema(columns))
+    return save_report(iter_rows(table), filename, columns)
@@ -0,0 +1,252 @@
+"""
+Behaviour tests for the LinkedIn Ads client against the local mock API
+Run with: python -m unittest test_linkedin_ads (or python -m pytest)
+"""
+
+import asyncio
+import importlib.util
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from linkedin_ads_cache import SQLiteResponseCache
+from linkedin_ads_mock import Faults, MockData, MockLinkedInAdsServer
+from linkedin_ads_report import (
+    AuthenticationError,
+    LinkedInAdsClient,
+    build_report,
+    fetch_report_data,
+    generate_report,
+    run_batch,
+)
+from linkedin_ads_ratelimit import RateLimiter
+from linkedin_ads_state import AnalyticsStore
+from linkedin_ads_summary import summarize_report
+from linkedin_ads_timeseries import AnalyticsTimeSeries
+
+
+def unlimited() -> RateLimiter:
+    """A rate limiter that never delays, so tests are not paced like the real API"""
+    return RateLimiter(app_rate=None, account_rate=None, backoff_max=0.1)
+
+
+def report_rows(client: LinkedInAdsClient, days: int):
+    """Report rows as tuples in a stable order (ties in clicks may come out in any order)"""
+    return sorted(row.astuple() for row in generate_report(client, days))
+
+
+def rounded(rows):
+    """Rows with floats rounded, for sums that were added up in a different order"""
+    return [tuple(round(v, 6) if isinstance(v, float) else v for v in row) for row in rows]
+
+
+class MockAPITestCase(unittest.TestCase):
+    """Runs one mock server per test class; ``client()`` points a client at it"""
+
+    data = MockData(campaigns=5, creatives=60, days=60, active_creatives=40)
+    server_options = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockLinkedInAdsServer(cls.data, **cls.server_options).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def client(self, access_token: str = "token", **options) -> LinkedInAdsClient:
+        options.setdefault("rate_limiter", unlimited())
+        return LinkedInAdsClient(access_token, self.data.account_id, base_url=self.server.url, **options)
+
+    def requests_made(self) -> int:
+        return sum(self.server.stats.values())
+
+
+class CappedPageSizeTest(MockAPITestCase):
+    """The server returns at most 50 elements per page, whatever the client asks for"""
+
+    data = MockData(campaigns=400, creatives=10, days=7)
+    server_options = {"max_page_size": 50}
+
+    def test_sync_client_follows_short_pages(self):
+        with self.client(page_size=200) as client:
+            self.assertEqual(len(client.get_campaigns()), 400)
+
+    @unittest.skipIf(importlib.util.find_spec("aiohttp") is None, "aiohttp not installed")
+    def test_async_client_steps_by_returned_page_size(self):
+        from linkedin_ads_async import AsyncLinkedInAdsClient
+
+        async def campaigns():
+            async with AsyncLinkedInAdsClient("token", self.data.account_id, page_size=200,
+                                              rate_limiter=unlimited(), base_url=self.server.url) as client:
+                return await client.get_campaigns()
+
+        found = asyncio.run(campaigns())
+        self.assertEqual(len(found), 400)
+        self.assertEqual(len({c["id"] for c in found}), 400)
+
+
+class CappedPageSizeWithoutTotalTest(CappedPageSizeTest):
+    """As above, but offset pages carry no ``paging.total``, so clients walk them"""
+
+    server_options = {"max_page_size": 50, "paging_total": False}
+
+
+class RetryTest(MockAPITestCase):
+    """Injected 503s and 429s are retried and never reach the paging code"""
+
+    data = MockData(campaigns=20, creatives=60, days=14)
+    server_options = {"faults": Faults(rate_429=0.2, retry_after=30, fail_first=3, seed=7)}
+
+    def test_faults_are_retried_with_capped_waits(self):
+        limiter = RateLimiter(app_rate=None, account_rate=None, max_retries=10, backoff_max=0.05)
+        with self.client(rate_limiter=limiter, page_size=10) as client:
+            rows = report_rows(client, 14)
+        clean = MockLinkedInAdsServer(self.data).start()
+        try:
+            with LinkedInAdsClient("token", self.data.account_id, base_url=clean.url,
+                                   rate_limiter=unlimited(), page_size=10) as client:
+                self.assertEqual(rows, report_rows(client, 14))
+        finally:
+            clean.stop()
+
+        stats = limiter.stats()
+        failed = {status: sum(n for (_, s), n in self.server.stats.items() if s == status) for status in (429, 503)}
+        self.assertGreaterEqual(failed[503], 3)
+        self.assertGreater(failed[429], 0)
+        self.assertEqual(stats["retries"], failed[429] + failed[503])
+        self.assertEqual(stats["throttled_responses"], failed[429])
+        # Retry-After: 30 is clamped to backoff_max
+        self.assertLessEqual(stats["throttled_seconds"], stats["retries"] * 0.05 + 0.001)
+
+
+class AnalyticsTest(MockAPITestCase):
+
+    def test_chunked_report_equals_unchunked(self):
+        with self.client() as client:
+            expected = report_rows(client, 30)
+        with self.client(analytics_chunk="week") as client:
+            self.assertEqual(report_rows(client, 30), expected)
+
+    def test_widening_days_backfills_the_state_store(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = AnalyticsStore(os.path.join(tmp, "state.db"))
+            try:
+                with self.client(state_store=store) as client:
+                    report_rows(client, 7)
+                    widened = report_rows(client, 30)
+            finally:
+                store.close()
+        with self.client() as client:
+            self.assertEqual(widened, report_rows(client, 30))
+
+    def test_changing_metrics_resyncs_the_state_store(self):
+        metrics = ["clicks", "impressions", "cost_in_local_currency", "cpc"]
+        with tempfile.TemporaryDirectory() as tmp:
+            store = AnalyticsStore(os.path.join(tmp, "state.db"))
+            try:
+                with self.client(state_store=store) as client:
+                    report_rows(client, 14)
+                with self.client(state_store=store, metrics=metrics) as client:
+                    synced = rounded(report_rows(client, 14))
+            finally:
+                store.close()
+        with self.client(metrics=metrics) as client:
+            self.assertEqual(synced, rounded(report_rows(client, 14)))
+
+    def test_referenced_only_equals_full_listing(self):
+        with self.client() as client:
+            expected = report_rows(client, 14)
+        with self.client(referenced_only=True) as client:
+            self.assertEqual(report_rows(client, 14), expected)
+        self.assertTrue(expected)
+
+
+@unittest.skipIf(importlib.util.find_spec("pyarrow") is None, "pyarrow not installed")
+class VectorizedEngineTest(MockAPITestCase):
+    """The arrow engine produces the same rows and summary as the Python engine"""
+
+    def test_report_and_summary_match_python_engine(self):
+        import linkedin_ads_vectorized
+
+        metrics = ["clicks", "impressions", "cost_in_local_currency", "ctr", "cpc"]
+        with self.client(metrics=metrics) as client:
+            campaigns_map, creatives_map, analytics = fetch_report_data(client, 14)
+            # Rows for campaigns and creatives missing from the listings fall back to "Unknown"
+            for key in list(campaigns_map)[:2]:
+                del campaigns_map[key]
+            for key in list(creatives_map)[:5]:
+                del creatives_map[key]
+            expected = build_report(client, campaigns_map, creatives_map, analytics)
+            rows = linkedin_ads_vectorized.build_report(client, campaigns_map, creatives_map, analytics)
+            table = linkedin_ads_vectorized.build_report_table(client, campaigns_map, creatives_map, analytics)
+
+        self.assertEqual(rows, [dict(row) for row in expected])
+        self.assertTrue(any(row["campaign_name"] == "Unknown" for row in rows))
+        summary = summarize_report(expected, metrics=metrics)
+        self.assertFalse(summary.pop("approximate"))
+        summary["top"] = [dict(row) for row in summary["top"]]
+        self.assertEqual(linkedin_ads_vectorized.summarize_table(table), summary)
+
+
+class LazyAuthTest(MockAPITestCase):
+
+    data = MockData(campaigns=2, creatives=10, days=7)
+    server_options = {"valid_tokens": ["good"]}
+
+    def test_rejected_token_fails_on_first_call(self):
+        before = self.requests_made()
+        with self.client("bad", lazy_auth=True) as client:
+            with self.assertRaises(AuthenticationError):
+                generate_report(client, 7)
+        self.assertEqual(self.requests_made() - before, 1)
+
+    def test_valid_token_skips_the_connection_test(self):
+        with self.client("good", lazy_auth=True) as client:
+            self.assertTrue(report_rows(client, 7))
+            self.assertTrue(client.auth_confirmed)
+        self.assertNotIn(("/v2/me", 200), self.server.stats)
+
+    def test_batch_with_rejected_token_exits_once(self):
+        before = self.requests_made()
+        with tempfile.TemporaryDirectory() as tmp, self.assertRaises(SystemExit):
+            run_batch("bad", [self.data.account_id, "507539078"], 7, output_dir=tmp,
+                      client_options={"base_url": self.server.url, "rate_limiter": unlimited(),
+                                      "lazy_auth": True})
+        self.assertEqual(self.requests_made() - before, 1)
+
+
+class ResponseCacheTest(MockAPITestCase):
+
+    data = MockData(campaigns=2, creatives=10, days=7)
+    server_options = {"valid_tokens": ["good"]}
+
+    def test_shared_cache_does_not_serve_another_token(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SQLiteResponseCache(os.path.join(tmp, "cache.db"))
+            try:
+                with self.client("good", response_cache=cache) as client:
+                    self.assertTrue(client.get_campaigns())
+                with self.client("bad", response_cache=cache, lazy_auth=True) as client:
+                    with self.assertRaises(AuthenticationError):
+                        client.get_campaigns()
+            finally:
+                cache.close()
+
+
+class TimeSeriesTest(unittest.TestCase):
+
+    def test_trend_needs_two_complete_weeks(self):
+        end = date.today()
+        self.assertIsNone(AnalyticsTimeSeries(end - timedelta(days=7), end).week_over_week())
+        self.assertIsNotNone(AnalyticsTimeSeries(end - timedelta(days=14), end).week_over_week())
+
+    def test_monthly_series_is_labelled_from_its_start(self):
+        series = AnalyticsTimeSeries(date(2026, 8, 18), date(2026, 10, 17), "MONTHLY")
+        self.assertEqual(series.dates(), [date(2026, 8, 18), date(2026, 9, 1), date(2026, 10, 1)])
+        self.assertEqual(series.complete_periods(), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()